@@ -1,13 +1,396 @@
 # auth.py
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import threading
+import time
+
+import pandas as pd
 import streamlit as st
+import streamlit.components.v1 as components
 
-ALLOWED_USERS = st.secrets["admin"]["allowed_emails"]
+from helpers import b64url_decode, b64url_encode
+from metrics import timed_fetch
 
-def require_login():
-    user = st.session_state.get("user")
+logger = logging.getLogger(__name__)
+
+VERDICT_KEY = "_auth_verdict"
+ALL_DIVISIONS = -1  # 본부 비트맵: 모든 비트 (설정에 없는 본부 포함)
+POLICY_RETRY_AFTER_S = 300  # 권한 시트 읽기 실패 후 이 시간 동안은 요청하지 않고 대체 정책 사용
+
+# 세션 쿠키: 새로고침해도 Google 로그인 없이 로컬 서명 검증만으로 복원
+SESSION_COOKIE = "ssp_session"
+SESSION_TTL_HOURS = 12
+COOKIE_OP_KEY = "_session_cookie_op"   # 다음 화면 출력 때 쿠키 설정/삭제
+EXPIRED_KEY = "_expired_session"       # 서명은 맞지만 만료된 토큰 내용 (홈에서 refresh token 으로 갱신)
+LOGGED_OUT_KEY = "_logged_out"         # 로그아웃한 세션: 다시 로그인할 때까지 쿠키로 복원하지 않음
+REFRESH_TOKEN_TTL_DAYS = 30            # 이보다 오래된 refresh token 은 서버 메모리에서 버림
+MAX_REFRESH_TOKENS = 10_000            # 보관 개수 상한 (넘으면 오래된 것부터)
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+class AccessPolicy:
+    """secrets [admin] 를 한 번 컴파일한 접근 정책. 판정은 집합 조회라 허용 목록 크기와 무관
+
+    [admin]
+    allowed_emails = ["a@seah.co.kr"]      # 개별 허용
+    admin_emails = ["a@seah.co.kr"]
+    allowed_domains = ["seah.co.kr"]       # 도메인 전체 허용 (선택)
+    denied_emails = ["퇴사자@seah.co.kr"]  # 도메인·그룹 허용보다 우선 (선택)
+
+    [admin.groups]                         # 그룹 = 이메일/도메인 목록, 구성원은 모두 허용 (선택)
+    기획팀 = ["b@seah.co.kr", "@seah-cp.co.kr"]
+
+    본부별 권한 (선택, 없으면 허용된 사용자는 전 본부):
+    [admin.roles]                          # 역할 → 본부 key 목록 ("*" = 전 본부)
+    임원 = ["*"]
+    영업 = ["sa", "gs"]
+    [admin.user_roles]                     # 이메일 / 그룹 / "@도메인" → 역할 목록
+    "b@seah.co.kr" = ["영업"]
+    기획팀 = ["임원"]
+    default_roles = []                     # [admin] 에 둠. 매핑 없는 사용자의 역할
+    permissions_url = "CSV 주소"           # [admin] 에 둠. 열: 대상(이메일/그룹/@도메인), 본부("sa,gs" 또는 "*")
+    관리자는 항상 전 본부.
+    """
+
+    def __init__(self, allowed_emails=(), admin_emails=(), allowed_domains=(), denied_emails=(), groups=None,
+                 roles=None, user_roles=None, default_roles=None, division_rules=()):
+        self.groups = {}         # 그룹 → 이메일 집합
+        self.group_domains = {}  # 그룹 → 도메인 집합 ("@도메인" 항목)
+        self.email_groups = {}   # 이메일 → 속한 그룹 (본부 권한 합산용)
+        self.domain_groups = {}  # 도메인 → 속한 그룹
+        for name, members in (groups or {}).items():
+            members = [normalize_email(m) for m in members]
+            self.groups[name] = frozenset(m for m in members if not m.startswith("@"))
+            self.group_domains[name] = frozenset(m[1:] for m in members if m.startswith("@"))
+            for email in self.groups[name]:
+                self.email_groups.setdefault(email, []).append(name)
+            for domain in self.group_domains[name]:
+                self.domain_groups.setdefault(domain, []).append(name)
+
+        # 본부 권한 → 비트맵. 대상(이메일/그룹/@도메인)마다 역할·시트 규칙을 미리 OR 해 둠
+        self.division_bits = {}  # 본부 key → 비트
+        role_masks = {role: self._mask(keys) for role, keys in (roles or {}).items()}
+        self.target_masks = {}
+        for target, role_names in (user_roles or {}).items():
+            self._grant(target, self._roles_mask(role_masks, role_names))
+        for target, keys in division_rules:
+            self._grant(target, self._mask(keys))
+        if default_roles is None:
+            # 본부 권한 설정이 전혀 없으면 기존처럼 전 본부
+            self.default_mask = ALL_DIVISIONS if not (roles or user_roles or division_rules) else 0
+        else:
+            self.default_mask = self._roles_mask(role_masks, default_roles)
+
+        self.allowed = frozenset(map(normalize_email, allowed_emails)).union(*self.groups.values())
+        self.domains = frozenset(d.strip().lower().lstrip("@") for d in allowed_domains).union(*self.group_domains.values())
+        self.admins = frozenset(map(normalize_email, admin_emails))
+        self.degraded = False  # 권한 시트를 못 읽어 시트 권한 없이 만든 정책 (access_policy 참고)
+        self.denied = frozenset(map(normalize_email, denied_emails))
+        # 세션별 판정 캐시 무효화용 (secrets 가 바뀌어 다시 컴파일되면 달라짐)
+        self.version = hash((
+            self.allowed, self.domains, self.admins, self.denied,
+            frozenset(self.target_masks.items()), frozenset(self.division_bits.items()), self.default_mask,
+        ))
+
+    def _mask(self, keys):
+        mask = 0
+        for key in keys:
+            key = key.strip()
+            if key == "*":
+                return ALL_DIVISIONS
+            if key:
+                mask |= self.division_bits.setdefault(key, 1 << len(self.division_bits))
+        return mask
+
+    @staticmethod
+    def _roles_mask(role_masks, role_names):
+        mask = 0
+        for role in role_names:
+            mask |= role_masks.get(role, 0)
+        return mask
+
+    def _grant(self, target, mask):
+        target = target.strip()
+        key = normalize_email(target) if "@" in target else target
+        self.target_masks[key] = self.target_masks.get(key, 0) | mask
+
+    @classmethod
+    def from_config(cls, conf, division_rules=()):
+        return cls(
+            conf.get("allowed_emails", []), conf.get("admin_emails", []), conf.get("allowed_domains", []),
+            conf.get("denied_emails", []), conf.get("groups", {}),
+            conf.get("roles", {}), conf.get("user_roles", {}),
+            # 권한 시트를 쓰면 시트가 비어 있어도 기본은 권한 없음
+            conf.get("default_roles", [] if conf.get("permissions_url") else None), division_rules,
+        )
+
+    def allows(self, email):
+        email = normalize_email(email)
+        if not email or email in self.denied:
+            return False
+        return email in self.allowed or email.rpartition("@")[2] in self.domains
+
+    def is_admin(self, email):
+        return normalize_email(email) in self.admins
+
+    def division_mask(self, email):
+        """사용자의 본부 비트맵 (기본 역할 | 이메일 | @도메인 | 속한 그룹)"""
+        if self.is_admin(email):
+            return ALL_DIVISIONS
+        email = normalize_email(email)
+        domain = email.rpartition("@")[2]
+        mask = self.default_mask | self.target_masks.get(email, 0) | self.target_masks.get(f"@{domain}", 0)
+        for group in self.email_groups.get(email, []) + self.domain_groups.get(domain, []):
+            mask |= self.target_masks.get(group, 0)
+        return mask
+
+    def mask_allows(self, mask, division):
+        if mask == ALL_DIVISIONS:
+            return True
+        bit = self.division_bits.get(division)
+        return bit is not None and bool(mask & bit)
+
+
+def _division_rules(url):
+    """권한 시트: 대상, 본부 열 → [(대상, [본부 key...])]"""
+    with timed_fetch("sheets"):
+        df = pd.read_csv(url, dtype=str).fillna("")
+    df.columns = df.columns.str.strip()
+    return [(row["대상"], row["본부"].split(",")) for _, row in df.iterrows() if row["대상"].strip()]
+
+
+@st.cache_resource(ttl=1800)
+def _compile_policy():
+    # 권한 시트 읽기 실패 시 예외 → 캐시되지 않음
+    conf = st.secrets["admin"]
+    rules = _division_rules(conf["permissions_url"]) if conf.get("permissions_url") else ()
+    return AccessPolicy.from_config(conf, rules)
+
+
+@st.cache_resource
+def _policy_fallback():
+    return {"last_good": None, "degraded": None, "failed_at": 0.0}, threading.Lock()
+
+
+def access_policy():
+    """접근 정책. 권한 시트를 못 읽으면 마지막 정상 정책, 그것도 없으면 시트 권한 없이 만든 정책
+    (시트로만 받은 본부 권한은 모두 거부, degraded=True) — 페이지는 깨지지 않음"""
+    state, lock = _policy_fallback()
+    if time.time() - state["failed_at"] >= POLICY_RETRY_AFTER_S:
+        try:
+            policy = _compile_policy()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("권한 시트를 읽지 못해 대체 정책 사용: %s", e)
+            with lock:
+                state["failed_at"] = time.time()
+        else:
+            state["last_good"] = policy
+            return policy
+    if state["last_good"] is not None:
+        return state["last_good"]
+    with lock:
+        if state["degraded"] is None:
+            state["degraded"] = AccessPolicy.from_config(st.secrets["admin"])
+            state["degraded"].degraded = True
+        return state["degraded"]
+
+
+def _verdict(user):
+    """(허용, 관리자, 본부 비트맵) — 세션에 기억해 두고 같은 사용자·같은 정책이면 재사용"""
+    policy = access_policy()
+    email = user.get("email")
+    cached = st.session_state.get(VERDICT_KEY)
+    if cached is not None and cached[0] == email and cached[1] == policy.version:
+        return cached[2:]
+    verdict = (policy.allows(email), policy.is_admin(email), policy.division_mask(email))
+    st.session_state[VERDICT_KEY] = (email, policy.version, *verdict)
+    return verdict
+
+
+def _stop(message):
+    # 기본 사이드바 메뉴를 숨겼으므로(render_nav 는 권한 확인 뒤에만 그림) 홈으로 가는 길은 남김
+    from navigation import HOME_PAGE  # navigation 이 auth 를 가져오므로 여기서
+
+    st.error(message)
+    st.page_link(HOME_PAGE, label="홈으로 이동", icon="🏠")
+    st.stop()
+
+
+def require_login(division=None):
+    """로그인·허용 여부 확인. division(본부 key)을 주면 그 본부 권한까지 확인 후 없으면 여기서 중단"""
+    user = restore_session()
     if not user:
-        st.error("⛔ 로그인 필요: 먼저 홈 화면에서 로그인해 주세요.")
-        st.stop()
-    elif user.get("email") not in ALLOWED_USERS:
-        st.error("⛔ 접근 불가: 권한이 없습니다.")
-        st.stop()
+        _stop("⛔ 로그인 필요: 먼저 홈 화면에서 로그인해 주세요.")
+    elif not _verdict(user)[0]:
+        _stop("⛔ 접근 불가: 권한이 없습니다.")
+    elif division is not None and not can_view_division(division):
+        _stop("⛔ 접근 불가: 이 본부 화면을 볼 권한이 없습니다.")
+
+def is_admin():
+    user = restore_session()
+    return bool(user) and _verdict(user)[1]
+
+def can_view_division(division):
+    user = restore_session()
+    return bool(user) and access_policy().mask_allows(_verdict(user)[2], division)
+
+def visible_divisions(divisions):
+    """본부 설정 dict 에서 현재 사용자가 볼 수 있는 본부만"""
+    return {key: conf for key, conf in divisions.items() if can_view_division(key)}
+
+
+# =========================
+# 서명된 세션 토큰 (secrets [session] secret_key 가 없으면 사용 안 함)
+# =========================
+def _session_conf():
+    return st.secrets.get("session", {})
+
+
+def _sign(body, key):
+    return b64url_encode(hmac.new(key.encode(), body.encode(), hashlib.sha256).digest())
+
+
+def issue_session_token(user, sid, key, ttl_hours=SESSION_TTL_HOURS, now=None):
+    """이메일·이름·사진 + 만료 시각을 HMAC-SHA256 으로 서명한 토큰"""
+    now = time.time() if now is None else now
+    payload = {
+        "email": user.get("email"), "name": user.get("name"), "picture": user.get("picture", ""),
+        "sid": sid, "exp": int(now + ttl_hours * 3600),
+    }
+    body = b64url_encode(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode())
+    return f"{body}.{_sign(body, key)}"
+
+
+def verify_session_token(token, key, now=None):
+    """(내용, 만료 여부). 서명이 틀리거나 형식이 잘못되면 (None, False)"""
+    body, _, signature = (token or "").partition(".")
+    try:
+        # compare_digest 는 비ASCII str 에 TypeError → bytes 로 비교, 인코딩 안 되는 값은 위조로 취급
+        valid = bool(body) and hmac.compare_digest(signature.encode("ascii"), _sign(body, key).encode("ascii"))
+    except UnicodeEncodeError:
+        return None, False
+    if not valid:
+        return None, False
+    try:
+        payload = json.loads(b64url_decode(body))
+    except ValueError:
+        return None, False
+    now = time.time() if now is None else now
+    return payload, payload.get("exp", 0) <= now
+
+
+@st.cache_resource
+def _refresh_tokens():
+    # sid → (Google refresh token, 저장 시각). 브라우저로 보내지 않고 서버 메모리에만 보관 (재시작 시 다시 로그인)
+    # dict 는 넣은 순서를 유지하므로 앞쪽이 가장 오래된 항목
+    return {}, threading.Lock()
+
+
+def remember_refresh_token(sid, refresh_token, now=None):
+    store, lock = _refresh_tokens()
+    now = time.time() if now is None else now
+    with lock:
+        store[sid] = (refresh_token, now)
+        cutoff = now - REFRESH_TOKEN_TTL_DAYS * 86400
+        for old_sid, (_, saved_at) in list(store.items()):
+            if saved_at >= cutoff and len(store) <= MAX_REFRESH_TOKENS:
+                break
+            del store[old_sid]
+
+
+def pop_refresh_token(sid):
+    store, lock = _refresh_tokens()
+    with lock:
+        entry = store.pop(sid, None)
+    if entry is None or entry[1] < time.time() - REFRESH_TOKEN_TTL_DAYS * 86400:
+        return None
+    return entry[0]
+
+
+@st.cache_resource
+def _revoked_sids():
+    # 로그아웃한 sid → 쿠키 최대 만료 시각. 쿠키 삭제가 브라우저에 반영되기 전이나 복사된 쿠키로도 복원 불가
+    return {}, threading.Lock()
+
+
+def revoke_session(sid, ttl_hours=SESSION_TTL_HOURS):
+    revoked, lock = _revoked_sids()
+    now = time.time()
+    with lock:
+        for old_sid in [s for s, until in revoked.items() if until <= now]:
+            del revoked[old_sid]  # 만료된 토큰은 어차피 거부되므로 목록에서 뺌
+        revoked[sid] = now + ttl_hours * 3600
+
+
+def is_revoked(sid):
+    revoked, lock = _revoked_sids()
+    with lock:
+        return sid in revoked
+
+
+def restore_session():
+    """session_state 에 사용자가 없으면 세션 쿠키를 로컬 검증해 복원. 네트워크 호출 없음"""
+    user = st.session_state.get("user")
+    key = _session_conf().get("secret_key")
+    if user or not key or st.session_state.get(LOGGED_OUT_KEY):
+        # 로그아웃 직후 재실행의 st.context.cookies 는 첫 요청 때 값이라 지운 쿠키가 그대로 보임
+        return user
+    token = st.context.cookies.get(SESSION_COOKIE)
+    if not isinstance(token, str) or not token:  # AppTest 등 브라우저 없는 실행에서는 쿠키 대신 다른 값
+        return None
+    payload, expired = verify_session_token(token, key)
+    if payload is None or is_revoked(payload.get("sid")):
+        return None
+    if expired:
+        st.session_state[EXPIRED_KEY] = payload
+        return None
+    user = {"email": payload["email"], "name": payload.get("name"), "picture": payload.get("picture", "")}
+    st.session_state["user"] = user
+    st.session_state["_session_sid"] = payload.get("sid")
+    return user
+
+
+def start_session(user, refresh_token=None):
+    """로그인 직후: 서명 토큰 발급 → 다음 flush_session_cookie() 에서 쿠키로 저장"""
+    conf = _session_conf()
+    if not conf.get("secret_key"):
+        return
+    sid = secrets.token_urlsafe(16)
+    if refresh_token:
+        remember_refresh_token(sid, refresh_token)
+    ttl_hours = conf.get("ttl_hours", SESSION_TTL_HOURS)
+    token = issue_session_token(user, sid, conf["secret_key"], ttl_hours)
+    st.session_state["_session_sid"] = sid
+    st.session_state.pop(LOGGED_OUT_KEY, None)
+    st.session_state[COOKIE_OP_KEY] = (token, int(ttl_hours * 3600))
+
+
+def end_session():
+    """로그아웃: refresh token 폐기 + sid 서버 측 무효화 + 쿠키 삭제 예약"""
+    conf = _session_conf()
+    expired = st.session_state.pop(EXPIRED_KEY, None) or {}
+    for sid in {st.session_state.pop("_session_sid", None), expired.get("sid")} - {None}:
+        pop_refresh_token(sid)
+        revoke_session(sid, conf.get("ttl_hours", SESSION_TTL_HOURS))
+    if conf.get("secret_key"):
+        st.session_state[LOGGED_OUT_KEY] = True
+        st.session_state[COOKIE_OP_KEY] = ("", 0)
+
+
+def flush_session_cookie():
+    """예약된 쿠키 설정/삭제를 브라우저에 반영 (높이 0 컴포넌트의 스크립트가 상위 문서 쿠키를 씀).
+    주의: 스크립트가 쓰는 쿠키라 HttpOnly 를 붙일 수 없음 → 같은 출처의 JS(XSS 포함)가 토큰을 읽을 수 있음.
+    Streamlit 스크립트에서는 응답 헤더(Set-Cookie)를 보낼 수 없어 서버 측 설정 대신 만료·서명·로그아웃 무효화로 제한"""
+    op = st.session_state.pop(COOKIE_OP_KEY, None)
+    if op is None:
+        return
+    token, max_age = op
+    secure = "; Secure" if st.secrets["google_oauth"]["REDIRECT_URI"].startswith("https") else ""
+    cookie = f"{SESSION_COOKIE}={token}; Max-Age={max_age}; Path=/; SameSite=Lax{secure}"
+    components.html(f"<script>window.parent.document.cookie = {json.dumps(cookie)};</script>", height=0)
@@ -0,0 +1,78 @@
+# bench/auth_policy.py
+"""auth.py 접근 판정 마이크로벤치마크: 목록 선형 탐색 vs 컴파일된 정책 vs 세션 판정 캐시 (+ 본부 비트맵)
+
+    python bench/auth_policy.py --sizes 10 1000 5000 20000
+
+허용 목록 끝의 사용자(최악), 도메인 규칙으로 허용되는 사용자, 거부되는 사용자를 판정 1회당 µs 로 출력한다.
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from auth import AccessPolicy  # noqa: E402
+
+NUMBER = 20_000
+
+
+def _config(size):
+    emails = [f"user{i:05d}@seah.co.kr" for i in range(size)]
+    return {
+        "allowed_emails": emails,
+        "admin_emails": emails[:5],
+        "allowed_domains": ["seah-cp.co.kr"],
+        "groups": {f"그룹{g}": emails[g::50] for g in range(50)},
+        "roles": {f"역할{r}": [f"d{r}", f"d{r + 1}"] for r in range(10)},
+        "user_roles": {**{e: [f"역할{i % 10}"] for i, e in enumerate(emails)}, **{f"그룹{g}": ["역할0"] for g in range(50)}},
+        "default_roles": [],
+    }
+
+
+def _per_call_us(stmt):
+    return min(timeit.repeat(stmt, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def bench(size):
+    conf = _config(size)
+    allowed_list = conf["allowed_emails"]
+    policy = AccessPolicy.from_config(conf)
+    last, domain_user, stranger = allowed_list[-1], "new@seah-cp.co.kr", "nobody@example.com"
+
+    # require_login 의 세션 캐시 경로와 같은 비교 (이메일·정책 버전 일치 확인)
+    verdict = (last, policy.version, True, False)
+    verdict_mask = policy.division_mask(last)
+
+    def cached():
+        return verdict[0] == last and verdict[1] == policy.version and verdict[2]
+
+    return {
+        "list_scan": _per_call_us(lambda: last in allowed_list),
+        "list_miss": _per_call_us(lambda: stranger in allowed_list),
+        "policy": _per_call_us(lambda: policy.allows(last)),
+        "policy_domain": _per_call_us(lambda: policy.allows(domain_user)),
+        "policy_miss": _per_call_us(lambda: policy.allows(stranger)),
+        "session_cached": _per_call_us(cached),
+        "division_mask": _per_call_us(lambda: policy.division_mask(last)),
+        "mask_check": _per_call_us(lambda: policy.mask_allows(verdict_mask, "d3")),
+        "compile_ms": min(timeit.repeat(lambda: AccessPolicy.from_config(conf), number=1, repeat=3)) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 5000, 20000], help="허용 목록 크기")
+    args = parser.parse_args(argv)
+
+    print(f"{'목록 크기':>8} {'목록 탐색':>9} {'목록 미스':>9} {'정책':>7} {'도메인':>7} {'정책 미스':>9} {'세션 캐시':>9} {'비트맵 계산':>10} {'본부 확인':>9}  (µs/회)  컴파일")
+    for size in args.sizes:
+        r = bench(size)
+        print(
+            f"{size:>8} {r['list_scan']:9.3f} {r['list_miss']:9.3f} {r['policy']:7.3f} {r['policy_domain']:7.3f}"
+            f" {r['policy_miss']:9.3f} {r['session_cached']:9.3f} {r['division_mask']:10.3f} {r['mask_check']:9.3f}           {r['compile_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# bench/fixtures.py
+"""벤치마크·부하 테스트용 KPI 데이터 생성기 (실제 시트와 같은 열 구성의 CSV)
+
+    python bench/fixtures.py --out /tmp/ssp_data --numeric 60 --textual 10 --years 5 --memos 4
+    python bench/fixtures.py --out /tmp/ssp_data --extra-divisions 20 --stacked-groups 3 --text-chars 400
+
+divisions.toml 의 본부·UID 구조(상/중/하 그룹, 막대+선 UID 등)를 그대로 따르고, 추가 본부·그룹을 넣은
+divisions.toml 사본도 함께 쓴다. 사본을 쓰려면 SSP_DIVISIONS_TOML=<out>/divisions.toml 로 앱 실행.
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+import tomllib
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+UNITS = ["톤", "억원", "%", "건", "천THB"]
+STACK_LABELS = ["상", "중", "하"]
+FILLER = "진행 사항 점검 및 후속 조치 협의, 관련 부서 공유 완료. "
+
+
+class DatasetSpec:
+    """생성할 데이터 규모. 개수는 모두 본부·연도당"""
+
+    def __init__(self, divisions=None, extra_divisions=0, numeric=12, textual=2, stacked_groups=0,
+                 years=2, memos_per_month=1, text_chars=20, blank_future=True, seed=0):
+        self.divisions = divisions              # divisions.toml 의 key 목록 (None = 전체)
+        self.extra_divisions = extra_divisions  # 설정에 없는 가상 본부 수 (페이지 없음, 요약·검색·내보내기용)
+        self.numeric = numeric                  # 정량 KPI 수 (설정이 참조하는 UID 번호보다 작으면 늘어남)
+        self.textual = textual                  # 정성 KPI 수
+        self.stacked_groups = stacked_groups    # 설정 외 추가 상/중/하 그룹 수 (그룹당 UID 4개)
+        self.years = years                      # 당해 포함 연도 수
+        self.memos_per_month = memos_per_month
+        self.text_chars = text_chars            # 정성 실적·메모 본문 길이(대략)
+        self.blank_future = blank_future        # 당해 이번 달 이후 실적은 빈칸 (실제 입력 흐름)
+        self.seed = seed
+
+    @classmethod
+    def scaled(cls, scale):
+        """run_pages.py --sizes 용: scale 배수로 KPI·연도·메모를 함께 늘림"""
+        return cls(numeric=12 * scale, textual=2 * scale, years=scale + 1, memos_per_month=scale)
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def load_registry():
+    with open(ROOT / "divisions.toml", "rb") as f:
+        return tomllib.load(f)["divisions"]
+
+
+def _registry_numbers(conf):
+    """설정에서 참조하는 UID 번호 (정량 KPI로 만들어야 그래프/표가 그려짐)"""
+    uids = list(conf.get("bar_line_uids", [])) + list(conf.get("lower_is_better", []))
+    uids += list(conf.get("yearly_goal_text", {})) + list(conf.get("month_labels", {}))
+    for uid, group in conf.get("stacked_groups", {}).items():
+        uids += [uid, *group["sub_uids"]]
+    return [int(uid[-2:]) for uid in uids]
+
+
+def _text(rng, prefix, chars):
+    body = prefix
+    while len(body) < chars:
+        body += FILLER[:chars - len(body)] if rng.random() < 0.8 else "\\n"
+    return body
+
+
+def _write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _toml_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, list):
+        return "[" + ", ".join(_toml_value(v) for v in value) + "]"
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _toml_table(lines, header, table):
+    # 값 먼저, 하위 테이블은 [상위.하위] 로
+    lines.append(f"[{header}]")
+    lines += [f"{_toml_value(k) if not k.isidentifier() else k} = {_toml_value(v)}" for k, v in table.items() if not isinstance(v, dict)]
+    lines.append("")
+    for key, value in table.items():
+        if isinstance(value, dict):
+            _toml_table(lines, f"{header}.{_toml_value(key) if not key.isidentifier() else key}", value)
+
+
+def write_registry(path, divisions):
+    lines = ["# bench/fixtures.py 가 생성한 본부 설정 (SSP_DIVISIONS_TOML 로 사용)", ""]
+    for key, conf in divisions.items():
+        _toml_table(lines, f"divisions.{key}", conf)
+    Path(path).write_text("\n".join(lines), encoding="utf-8")
+
+
+def _plan_divisions(spec):
+    """생성 대상 본부 설정 (추가 그룹·가상 본부 반영)"""
+    registry = load_registry()
+    keys = spec.divisions or list(registry)
+    divisions = {key: json.loads(json.dumps(registry[key])) for key in keys}
+    for i in range(1, spec.extra_divisions + 1):
+        divisions[f"x{i:02d}"] = {"name": f"가상본부{i:02d}", "sheet": f"x{i:02d}", "memo": f"가상본부{i:02d}"}
+    return divisions
+
+
+def generate(out_dir, spec=None, year=None):
+    """본부별 target/result, memo, kama CSV + divisions.toml 사본 작성 → secrets [google_sheets] 에 넣을 경로 dict"""
+    spec = spec or DatasetSpec()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    today = datetime.today()
+    year = year or today.year
+    yy = year % 100
+    years = range(year - spec.years + 1, year + 1)
+    rng = random.Random(spec.seed)
+    divisions = _plan_divisions(spec)
+
+    sheets = {}
+    memo_rows = []
+    for key, conf in divisions.items():
+        prefix = conf["sheet"].upper()
+        n_numeric = max(spec.numeric, *_registry_numbers(conf), 1)
+
+        # 추가 상/중/하 그룹: 정량 KPI 뒤에 전체 + 하위 3개씩
+        groups = conf.setdefault("stacked_groups", {})
+        for _ in range(spec.stacked_groups):
+            total = n_numeric + 1
+            groups[f"{prefix}{yy:02d}{total:02d}"] = {
+                "sub_uids": [f"{prefix}{yy:02d}{total + k:02d}" for k in range(1, 4)],
+                "labels": STACK_LABELS,
+            }
+            n_numeric += 4
+
+        target_rows, result_rows = [], []
+        for y in years:
+            for n in range(1, n_numeric + spec.textual + 1):
+                uid = f"{prefix}{y % 100:02d}{n:02d}"
+                textual = n > n_numeric
+                unit = "" if textual else UNITS[n % len(UNITS)]
+                target_rows.append([uid, y, f"{prefix} 추진 목표 {n}", "정성" if textual else "정량", unit])
+                base = rng.randint(50, 500)
+                for m in range(1, 13):
+                    future = spec.blank_future and y == year and m > today.month
+                    if textual:
+                        result = "" if future else _text(rng, f"{m}월 실적 {n}: ", spec.text_chars)
+                        result_rows.append([uid, y, m, f"{m}월 목표 {n}", result])
+                    else:
+                        result = "" if future else round(base * rng.uniform(0.6, 1.3))
+                        result_rows.append([uid, y, m, base, result])
+            for m in range(1, 13):
+                if spec.blank_future and y == year and m > today.month:
+                    continue
+                for i in range(spec.memos_per_month):
+                    memo = _text(rng, f"{conf['memo']} {m}월 메모 {i + 1}\n", spec.text_chars)
+                    memo_rows.append([y, m, conf["memo"], f"입력자{i + 1}", memo])
+
+        target_path = out_dir / f"target_{conf['sheet']}.csv"
+        result_path = out_dir / f"result_{conf['sheet']}.csv"
+        _write_csv(target_path, ["UID", "년도", "추진 목표", "지표 유형", "단위"], target_rows)
+        _write_csv(result_path, ["UID", "년도", "월", "목표", "실적"], result_rows)
+        sheets[f"{conf['sheet']}_target_url"] = str(target_path)
+        sheets[f"{conf['sheet']}_result_url"] = str(result_path)
+
+    memo_path = out_dir / "memo.csv"
+    _write_csv(memo_path, ["년도", "월", "본부", "입력자", "메모"], memo_rows)
+    sheets["memo_url"] = str(memo_path)
+
+    kama_path = out_dir / "kama.csv"
+    _write_csv(kama_path, ["년", "월", "국내생산", "해외생산", "KD", "부품수출액(백만불)"], [
+        [y, m, rng.randint(250000, 350000), rng.randint(150000, 250000), rng.randint(500, 1500), rng.randint(1500, 2200)]
+        for y in range(2023, year + 1) for m in range(1, 13)
+    ])
+    sheets["kama_url"] = str(kama_path)
+
+    write_registry(out_dir / "divisions.toml", divisions)
+    return sheets
+
+
+def write_fixtures(out_dir, scale=1, year=None):
+    """run_pages.py 기본 데이터: scale 배수 크기"""
+    return generate(out_dir, DatasetSpec.scaled(scale), year)
+
+
+def raw_material_rows(year=None, count=None):
+    """홈 원자재 가격 API(odcloud) 응답의 data 목록. count 지정 시 year 12월에서 거슬러 count개월"""
+    year = year or datetime.today().year
+    first_year = 2020 if count is None else year - (count - 1) // 12
+    rng = random.Random(1)
+    rows = [
+        {"기간": f"{y}-{m:02d}", "철광석(달러_톤)": rng.randint(90, 140), "철스크랩(달러_톤)": rng.randint(330, 450)}
+        for y in range(first_year, year + 1) for m in range(1, 13)
+    ]
+    return rows if count is None else rows[-count:]
+
+
+def main(argv=None):
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", type=Path, required=True, help="CSV 출력 폴더")
+    parser.add_argument("--divisions", nargs="+", help="divisions.toml 본부 key (기본: 전체)")
+    parser.add_argument("--extra-divisions", type=int, default=defaults.extra_divisions)
+    parser.add_argument("--numeric", type=int, default=defaults.numeric, help="본부·연도당 정량 KPI 수")
+    parser.add_argument("--textual", type=int, default=defaults.textual, help="본부·연도당 정성 KPI 수")
+    parser.add_argument("--stacked-groups", type=int, default=defaults.stacked_groups, help="본부당 추가 상/중/하 그룹 수")
+    parser.add_argument("--years", type=int, default=defaults.years, help="당해 포함 연도 수")
+    parser.add_argument("--memos", type=int, default=defaults.memos_per_month, help="본부·월당 메모 수")
+    parser.add_argument("--text-chars", type=int, default=defaults.text_chars, help="정성 실적·메모 길이")
+    parser.add_argument("--fill-future", action="store_true", help="당해 이번 달 이후 실적도 채움")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec(
+        divisions=args.divisions, extra_divisions=args.extra_divisions, numeric=args.numeric,
+        textual=args.textual, stacked_groups=args.stacked_groups, years=args.years,
+        memos_per_month=args.memos, text_chars=args.text_chars, blank_future=not args.fill_future, seed=args.seed,
+    )
+    sheets = generate(args.out, spec)
+    size = sum(Path(p).stat().st_size for p in sheets.values())
+    print(f"# {args.out}: CSV {len(sheets)}개, {size / 2**20:.1f} MiB. secrets [google_sheets]:", file=sys.stderr)
+    for key, path in sheets.items():
+        print(f"{key} = {json.dumps(path, ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+# bench/load_test.py
+"""동시 접속 부하 테스트: 실제 Streamlit 서버 + 웹소켓 가상 세션 N개 (로컬 대체 서버 데이터)
+
+    python bench/load_test.py                                  # 기본: 동시 세션 10, 30 / 세션당 5페이지
+    python bench/load_test.py --sessions 20 50 100 --visits 8 --pages 영업본부 충주공장
+    python bench/load_test.py --dataset /tmp/ssp_data --latency-ms 200 --no-warmup
+
+세션마다 대체 서버 OAuth 로 로그인(?code=...)한 뒤 본부 페이지를 무작위로 방문하고, 요청부터
+script_finished 까지의 페이지 완료 시간 p50/p95/p99, 서버 프로세스 CPU·메모리(/proc)를 JSON 으로 기록한다.
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from streamlit.proto.Alert_pb2 import Alert  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from websockets.sync.client import connect  # noqa: E402
+
+from bench.fixtures import write_fixtures  # noqa: E402
+from bench.run_pages import DIVISIONS_ENV, HOME, RESULTS_DIR, _git_commit  # noqa: E402
+from bench.standin_server import StandinConfig, StandinServer, secrets_toml  # noqa: E402
+
+RUN_TIMEOUT = 120
+START_TIMEOUT = 60
+SAMPLE_INTERVAL_S = 0.25
+LOGIN_PAGE = "login"
+FINISHED = ForwardMsg.ScriptFinishedStatus
+
+
+class PageRunError(Exception):
+    pass
+
+
+# =========================
+# 앱 서버 (streamlit run 하위 프로세스)
+# =========================
+class AppServer:
+    def __init__(self, port, secrets_path, divisions_toml, log_path):
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+        env = {**os.environ, DIVISIONS_ENV: str(divisions_toml)}
+        cmd = [
+            sys.executable, "-m", "streamlit", "run", HOME,
+            "--server.port", str(port), "--server.address", "127.0.0.1", "--server.headless", "true",
+            "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+            "--secrets.files", str(secrets_path),
+        ]
+        self._log = open(log_path, "w", encoding="utf-8")
+        self.proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=self._log, stderr=subprocess.STDOUT)
+
+    def wait_ready(self):
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"앱 서버가 종료됨 (코드 {self.proc.returncode}), 로그: {self._log.name}")
+            with contextlib.suppress(OSError):
+                with urllib.request.urlopen(f"{self.url}/_stcore/health", timeout=1) as resp:
+                    if resp.status == 200:
+                        return self
+            time.sleep(0.2)
+        raise RuntimeError(f"앱 서버가 {START_TIMEOUT}초 안에 시작되지 않음, 로그: {self._log.name}")
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        self._log.close()
+
+
+class ProcessSampler:
+    """서버 프로세스 CPU 사용률(코어 1개 = 100%)·RSS 주기 측정. /proc 이 없으면 값 없음"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.available = Path(f"/proc/{pid}/stat").exists()
+        self._ticks = os.sysconf("SC_CLK_TCK") if self.available else 1
+        self._page = os.sysconf("SC_PAGE_SIZE") if self.available else 1
+        self._stop = threading.Event()
+        self._thread = None
+        self.cpu_pct, self.rss = [], []
+
+    def _read(self):
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{self.pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        # utime, stime (comm 뒤 필드 기준 11, 12번째)
+        return (int(fields[11]) + int(fields[12])) / self._ticks, rss_pages * self._page
+
+    def _loop(self):
+        last_cpu, _ = self._read()
+        last_t = time.monotonic()
+        while not self._stop.wait(SAMPLE_INTERVAL_S):
+            try:
+                cpu, rss = self._read()
+            except OSError:
+                return
+            now = time.monotonic()
+            self.cpu_pct.append((cpu - last_cpu) / (now - last_t) * 100)
+            self.rss.append(rss)
+            last_cpu, last_t = cpu, now
+
+    def __enter__(self):
+        if self.available:
+            self._thread = threading.Thread(target=self._loop, name="load-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def summary(self):
+        if not self.cpu_pct:
+            return {"cpu_mean_pct": None, "cpu_max_pct": None, "rss_peak_mib": None}
+        return {
+            "cpu_mean_pct": round(statistics.fmean(self.cpu_pct), 1),
+            "cpu_max_pct": round(max(self.cpu_pct), 1),
+            "rss_peak_mib": round(max(self.rss) / 2**20, 1),
+        }
+
+    def rss_now_mib(self):
+        return round(self._read()[1] / 2**20, 1) if self.available else None
+
+
+# =========================
+# 가상 세션 (브라우저 탭 1개에 해당하는 웹소켓)
+# =========================
+class VirtualSession:
+    def __init__(self, ws):
+        self.ws = ws
+        self.pages = {}  # 페이지 이름 → page_script_hash
+
+    @staticmethod
+    def connect(app_url):
+        ws_url = app_url.replace("http://", "ws://", 1) + "/_stcore/stream"
+        return connect(ws_url, subprotocols=["streamlit"], max_size=None, open_timeout=RUN_TIMEOUT)
+
+    def run(self, query_string="", page_script_hash=""):
+        """스크립트 1회 실행 요청 → 완료까지 (초, 예외·st.error 요소 수)"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = query_string
+        msg.rerun_script.page_script_hash = page_script_hash
+        started = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        exceptions = 0
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(self.ws.recv(timeout=RUN_TIMEOUT))
+            kind = fwd.WhichOneof("type")
+            if kind in ("new_session", "navigation"):
+                body = getattr(fwd, kind)
+                self.pages.update({p.page_name: p.page_script_hash for p in body.app_pages})
+            elif kind == "delta":
+                element = fwd.delta.new_element
+                if element.WhichOneof("type") == "exception" or (
+                    element.WhichOneof("type") == "alert" and element.alert.format == Alert.ERROR
+                ):
+                    exceptions += 1
+            elif kind == "script_finished":
+                if fwd.script_finished == FINISHED.FINISHED_WITH_COMPILE_ERROR:
+                    raise PageRunError("compile error")
+                # st.rerun 으로 끝난 실행은 이어지는 실행까지 기다림
+                if fwd.script_finished == FINISHED.FINISHED_SUCCESSFULLY:
+                    return time.perf_counter() - started, exceptions
+
+
+def _page_hash(session, name):
+    for page_name, page_hash in session.pages.items():
+        if name in page_name:
+            return page_hash
+    raise PageRunError(f"페이지 없음: {name} (서버 페이지: {', '.join(session.pages)})")
+
+
+def session_worker(app_url, standin, pages, visits, think_ms, seed, barrier, samples):
+    """로그인 1회 + 무작위 페이지 visits 회. samples 에 (페이지, 초, 오류 요소 수, 실패 사유) 추가"""
+    rng = random.Random(seed)
+    barrier.wait()  # 월말 회의처럼 모든 세션이 동시에 시작
+    try:
+        with VirtualSession.connect(app_url) as ws:
+            _visit_pages(VirtualSession(ws), standin, pages, visits, think_ms, rng, samples)
+    except Exception as e:  # 연결 실패 등: 세션 단위 오류로 기록
+        samples.append((LOGIN_PAGE, None, 0, repr(e)))
+
+
+def _visit_pages(session, standin, pages, visits, think_ms, rng, samples):
+    seconds, exceptions = session.run(query_string=f"code={standin.issue_code()}")
+    samples.append((LOGIN_PAGE, seconds, exceptions, None))
+    for _ in range(visits):
+        page = rng.choice(pages)
+        if think_ms:
+            time.sleep(rng.uniform(0.5, 1.5) * think_ms / 1000)
+        try:
+            seconds, exceptions = session.run(page_script_hash=_page_hash(session, page))
+            samples.append((page, seconds, exceptions, None))
+        except (PageRunError, TimeoutError) as e:
+            samples.append((page, None, 0, repr(e)))
+
+
+# =========================
+# 집계
+# =========================
+def _percentile(values, pct):
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # nearest-rank
+    return ordered[int(rank) - 1]
+
+
+def _stats(seconds):
+    if not seconds:
+        return {"count": 0, "p50_s": None, "p95_s": None, "p99_s": None, "max_s": None}
+    return {
+        "count": len(seconds),
+        "p50_s": round(_percentile(seconds, 50), 4),
+        "p95_s": round(_percentile(seconds, 95), 4),
+        "p99_s": round(_percentile(seconds, 99), 4),
+        "max_s": round(max(seconds), 4),
+    }
+
+
+def summarize(samples):
+    pages = {}
+    for page, seconds, _, _ in samples:
+        pages.setdefault(page, [])
+        if seconds is not None:
+            pages[page].append(seconds)
+    visits = [s for p, s, _, _ in samples if p != LOGIN_PAGE and s is not None]
+    return {
+        "pages_overall": _stats(visits),
+        "by_page": {page: _stats(values) for page, values in sorted(pages.items())},
+        "failed_runs": sum(1 for *_, error in samples if error),
+        "error_elements": sum(e for _, _, e, _ in samples),
+        "errors": sorted({error for *_, error in samples if error})[:10],
+    }
+
+
+def run_level(app, standin, sampler_pid, sessions, pages, visits, think_ms, seed):
+    samples = []
+    barrier = threading.Barrier(sessions)
+    threads = [
+        threading.Thread(
+            target=session_worker, name=f"vsession-{i}",
+            args=(app.url, standin, pages, visits, think_ms, seed + i, barrier, samples),
+        )
+        for i in range(sessions)
+    ]
+    with ProcessSampler(sampler_pid) as sampler:
+        rss_before = sampler.rss_now_mib()
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - started
+    completed = sum(1 for _, s, _, _ in samples if s is not None)
+    return {
+        "sessions": sessions,
+        "wall_s": round(wall, 2),
+        "runs_per_s": round(completed / wall, 2),
+        "rss_before_mib": rss_before,
+        **sampler.summary(),
+        **summarize(samples),
+    }
+
+
+def _free_port():
+    import socket
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _division_pages(filters):
+    names = sorted(p.stem for p in (ROOT / "pages").glob("*.py"))
+    # 서버 페이지 이름은 파일명에서 숫자 접두어를 뺀 것 (예: 1_1.영업본부 → 1.영업본부)
+    names = [name.split("_", 1)[-1] for name in names]
+    if filters:
+        names = [n for n in names if any(f in n for f in filters)]
+    return names
+
+
+def run(levels, visits, think_ms, pages, dataset=None, scale=1, server_config=None, warmup=True, seed=0):
+    with contextlib.ExitStack() as stack:
+        if dataset is None:
+            dataset = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="ssp_load_")))
+            write_fixtures(dataset, scale=scale)
+        standin = StandinServer(dataset, server_config or StandinConfig()).start()
+        stack.callback(standin.stop)
+
+        tmp = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="ssp_load_app_")))
+        secrets_path = tmp / "secrets.toml"
+        secrets_path.write_text(secrets_toml(standin.secrets()), encoding="utf-8")
+        app = AppServer(_free_port(), secrets_path, dataset / "divisions.toml", tmp / "streamlit.log")
+        stack.callback(app.stop)
+        app.wait_ready()
+
+        if warmup:
+            # 캐시 채우기: 세션 1개로 모든 대상 페이지 1회씩
+            run_level(app, standin, app.proc.pid, 1, pages, len(pages) * 2, 0, seed)
+
+        results = []
+        for sessions in levels:
+            row = run_level(app, standin, app.proc.pid, sessions, pages, visits, think_ms, seed)
+            results.append(row)
+            print(_format_row(row), flush=True)
+        return {
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": sys.version.split()[0],
+                "visits": visits,
+                "think_ms": think_ms,
+                "pages": pages,
+                "warmup": warmup,
+                "dataset": str(dataset) if dataset is not None else None,
+                "standin": standin.config.as_dict(),
+                "cpu_count": os.cpu_count(),
+            },
+            "results": results,
+        }
+
+
+def _fmt_s(value):
+    return f"{value * 1000:7.0f}" if value is not None else "      -"
+
+
+def _format_row(row):
+    overall = row["pages_overall"]
+    cpu = f"CPU 평균 {row['cpu_mean_pct']}% 최대 {row['cpu_max_pct']}%" if row["cpu_mean_pct"] is not None else "CPU -"
+    fail = f"  실패 {row['failed_runs']}건" if row["failed_runs"] else ""
+    return (
+        f"세션 {row['sessions']:>4}  p50 {_fmt_s(overall['p50_s'])} ms  p95 {_fmt_s(overall['p95_s'])} ms"
+        f"  p99 {_fmt_s(overall['p99_s'])} ms  {row['runs_per_s']} 실행/s  {cpu}  RSS 최대 {row['rss_peak_mib']} MiB{fail}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 30], help="동시 세션 수 (단계별 순서대로 실행)")
+    parser.add_argument("--visits", type=int, default=5, help="세션당 페이지 방문 수")
+    parser.add_argument("--think-ms", type=int, default=0, help="방문 사이 대기 시간(±50% 무작위)")
+    parser.add_argument("--pages", nargs="+", help="페이지 이름 일부 (기본: pages/ 전체)")
+    parser.add_argument("--dataset", type=Path, help="bench/fixtures.py 로 만든 데이터 폴더")
+    parser.add_argument("--scale", type=int, default=1, help="--dataset 없을 때 생성할 데이터 크기 배수")
+    parser.add_argument("--latency-ms", type=int, default=0, help="대체 서버 응답 지연")
+    parser.add_argument("--warmup", action=argparse.BooleanOptionalAction, default=True, help="측정 전 캐시 채우기")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="결과 JSON 경로 (기본: bench/results/load-<시각>-<커밋>.json)")
+    args = parser.parse_args(argv)
+
+    pages = _division_pages(args.pages)
+    current = run(
+        args.sessions, args.visits, args.think_ms, pages, args.dataset, args.scale,
+        StandinConfig(latency_ms=args.latency_ms), args.warmup, args.seed,
+    )
+    out = args.out or RESULTS_DIR / f"load-{datetime.now():%Y%m%d-%H%M%S}-{current['meta']['commit'] or 'local'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(current, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n결과: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# bench/run_pages.py
+"""홈.py + pages/*.py 헤드리스 벤치마크 (AppTest, 로컬 CSV, 로그인·secrets 대체)
+
+    python bench/run_pages.py                          # 기본: 크기 1, 2, 4 / 반복 5
+    python bench/run_pages.py --sizes 1 8 --pages 영업본부 전사요약
+    python bench/run_pages.py --compare bench/results/이전결과.json
+    python bench/run_pages.py --server --latency-ms 200     # 로컬 대체 서버(HTTP) 경유
+    python bench/run_pages.py --dataset /tmp/ssp_data       # bench/fixtures.py 로 미리 만든 데이터
+
+페이지·크기별로 캐시를 비운 첫 실행(cold), 재실행 중앙값(warm), 최대 메모리(tracemalloc),
+전송 요소 수/바이트(payload 미터)를 JSON 으로 기록한다.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import requests  # noqa: E402
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from bench.fixtures import raw_material_rows, write_fixtures  # noqa: E402
+from bench.standin_server import StandinConfig, StandinServer  # noqa: E402
+
+HOME = "홈.py"
+BENCH_USER = {"email": "bench@example.com", "name": "벤치마크", "picture": ""}
+RESULTS_DIR = ROOT / "bench" / "results"
+RUN_TIMEOUT = 120
+DIVISIONS_ENV = "SSP_DIVISIONS_TOML"  # division_page.DIVISIONS_ENV (앱 모듈은 secrets 가 있어야 import 가능)
+
+
+def list_pages():
+    return [HOME] + sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("*.py"))
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def _fake_get(real_get):
+    # 홈 원자재 가격 API 만 로컬 응답으로 대체 (그 외 요청은 그대로)
+    def get(url, *args, **kwargs):
+        if "api.odcloud.kr" in str(url):
+            return _FakeResponse({"data": raw_material_rows()})
+        return real_get(url, *args, **kwargs)
+    return get
+
+
+def _app(page, sheets, endpoints):
+    at = AppTest.from_file(str(ROOT / HOME), default_timeout=RUN_TIMEOUT)
+    at.secrets["google_sheets"] = sheets
+    at.secrets["endpoints"] = endpoints
+    at.secrets["admin"] = {"allowed_emails": [BENCH_USER["email"]], "admin_emails": []}
+    at.secrets["google_oauth"] = {"GOOGLE_CLIENT_ID": "bench", "GOOGLE_CLIENT_SECRET": "bench", "REDIRECT_URI": "http://localhost:8501"}
+    at.secrets["api"] = {"raw_material_service_key": "bench"}
+    at.session_state["user"] = BENCH_USER
+    if page != HOME:
+        # 엔트리포인트(홈)에서 전환해야 st.page_link 등 멀티페이지 기능이 동작
+        at.switch_page(page)
+    return at
+
+
+def _timed_run(at):
+    started = time.perf_counter()
+    at.run()
+    return time.perf_counter() - started
+
+
+def _clear_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def bench_page(page, sheets, endpoints, repeat):
+    _clear_caches()
+    at = _app(page, sheets, endpoints)
+    cold = _timed_run(at)
+    errors = [e.value for e in at.exception]
+    warm = [_timed_run(at) for _ in range(repeat)]
+
+    run = at.session_state["_payload_last"] if "_payload_last" in at.session_state else None
+
+    # 메모리는 시간 측정과 분리 (tracemalloc 자체 부하)
+    _clear_caches()
+    tracemalloc.start()
+    _app(page, sheets, endpoints).run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "cold_s": round(cold, 4),
+        "warm_p50_s": round(statistics.median(warm), 4) if warm else None,
+        "warm_max_s": round(max(warm), 4) if warm else None,
+        "peak_mib": round(peak / 2**20, 2),
+        "elements": run.element_count if run else None,
+        "payload_kb": round(run.total_bytes / 1024, 1) if run else None,
+        "exceptions": errors,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def _datasets(sizes, dataset):
+    """(크기 이름, 데이터 폴더) — 미리 만든 데이터가 있으면 그것만, 없으면 크기별 임시 생성"""
+    if dataset is not None:
+        yield dataset.name, dataset
+        return
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"ssp_bench_{size}_") as tmp:
+            write_fixtures(tmp, scale=size)
+            yield size, Path(tmp)
+
+
+def _file_sheets(data_dir):
+    # target_sa.csv → sa_target_url, memo.csv → memo_url
+    sheets = {}
+    for path in data_dir.glob("*.csv"):
+        kind, _, sheet = path.stem.partition("_")
+        sheets[f"{sheet}_{kind}_url" if sheet else f"{kind}_url"] = str(path)
+    return sheets
+
+
+def run(sizes, repeat, pages, server_config=None, dataset=None):
+    """server_config 가 있으면 CSV·원자재 API 를 로컬 대체 서버(HTTP)로 제공, 없으면 파일 직접 읽기"""
+    results = []
+    for size, data_dir in _datasets(sizes, dataset):
+        with contextlib.ExitStack() as stack:
+            # 생성기가 쓴 본부 설정 사본(추가 본부·그룹 포함)을 앱이 읽도록
+            stack.enter_context(mock.patch.dict(os.environ, {DIVISIONS_ENV: str(data_dir / "divisions.toml")}))
+            endpoints = {}
+            if server_config is not None:
+                server = StandinServer(data_dir, server_config).start()
+                stack.callback(server.stop)
+                sheets, endpoints = server.sheet_urls(), server.endpoints()
+            else:
+                stack.enter_context(mock.patch.object(requests, "get", _fake_get(requests.get)))
+                sheets = _file_sheets(data_dir)
+            for page in pages:
+                row = {"page": page, "size": size, **bench_page(page, sheets, endpoints, repeat)}
+                results.append(row)
+                print(_format_row(row), flush=True)
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "repeat": repeat,
+            "server": server_config.as_dict() if server_config is not None else None,
+            "dataset": str(dataset) if dataset is not None else None,
+        },
+        "results": results,
+    }
+
+
+def _format_row(row):
+    warn = f"  예외 {len(row['exceptions'])}건" if row["exceptions"] else ""
+    return (
+        f"{row['page']:<32} x{str(row['size']):<3} cold {row['cold_s'] * 1000:8.0f} ms  warm {row['warm_p50_s'] * 1000:7.0f} ms"
+        f"  peak {row['peak_mib']:7.1f} MiB  요소 {row['elements']}  {row['payload_kb']} KB{warn}"
+    )
+
+
+def compare(current, baseline):
+    """같은 (페이지, 크기) 끼리 변화율 출력. 양수 = 느려짐/커짐"""
+    base = {(r["page"], r["size"]): r for r in baseline["results"]}
+    print(f"\n비교 기준: {baseline['meta'].get('commit')} ({baseline['meta'].get('created')})")
+    for row in current["results"]:
+        old = base.get((row["page"], row["size"]))
+        if old is None:
+            continue
+        changes = []
+        for field in ("cold_s", "warm_p50_s", "peak_mib", "payload_kb"):
+            if old.get(field) and row.get(field) is not None:
+                changes.append(f"{field} {(row[field] - old[field]) / old[field]:+.0%}")
+        print(f"{row['page']:<32} x{str(row['size']):<3} " + "  ".join(changes))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4], help="데이터 크기 배수")
+    parser.add_argument("--repeat", type=int, default=5, help="warm 재실행 횟수")
+    parser.add_argument("--pages", nargs="+", help="페이지 파일명 일부 (기본: 전체)")
+    parser.add_argument("--out", type=Path, help="결과 JSON 경로 (기본: bench/results/<시각>-<커밋>.json)")
+    parser.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument("--dataset", type=Path, help="bench/fixtures.py 로 만든 데이터 폴더 (지정 시 --sizes 무시)")
+    parser.add_argument("--server", action="store_true", help="로컬 대체 서버(HTTP) 경유로 데이터 제공")
+    parser.add_argument("--latency-ms", type=int, default=0, help="대체 서버 응답 지연")
+    args = parser.parse_args(argv)
+
+    pages = list_pages()
+    if args.pages:
+        pages = [p for p in pages if any(name in p for name in args.pages)]
+
+    server_config = StandinConfig(latency_ms=args.latency_ms) if args.server else None
+    current = run(args.sizes, args.repeat, pages, server_config, args.dataset)
+
+    out = args.out or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{current['meta']['commit'] or 'local'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(current, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n결과: {out}")
+
+    if args.compare:
+        compare(current, json.loads(args.compare.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+# bench/standin_server.py
+"""Google Sheets CSV / odcloud 원자재 API / Google OAuth 로컬 대체 서버 (네트워크 없이 테스트·벤치마크)
+
+    python bench/standin_server.py --scale 2 --latency-ms 300 --fail-rate 0.1
+
+시작 시 출력되는 secrets 조각을 .streamlit/secrets.toml 에 넣으면 앱 전체가 이 서버만 사용한다.
+실행 중 설정 변경: GET /__config?latency_ms=1000&fail_rate=0.5&fail_match=/sheets/
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench.fixtures import raw_material_rows, write_fixtures  # noqa: E402
+
+STANDIN_USER = {"id": "standin", "email": "standin@example.com", "verified_email": True, "name": "대체 사용자", "picture": ""}
+RSA_BITS = 2048
+JWKS_MAX_AGE_S = 21600   # Google 인증서 응답과 비슷한 Cache-Control
+
+
+# =========================
+# id_token 서명용 RSA 키 (대체 서버 전용, 시작할 때마다 새로 생성)
+# =========================
+class SigningKey:
+    """RS256 서명 키. jwk() 는 /oauth/certs 로 공개"""
+
+    def __init__(self, bits=RSA_BITS, kid="standin-1"):
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=bits)
+
+    def jwk(self):
+        jwk = RSAAlgorithm.to_jwk(self.private_key.public_key(), as_dict=True)
+        return {**jwk, "alg": "RS256", "use": "sig", "kid": self.kid}
+
+    def sign_jwt(self, claims):
+        return jwt.encode(claims, self.private_key, algorithm="RS256", headers={"kid": self.kid})
+
+
+class StandinConfig:
+    """응답 지연·실패 주입·응답 크기. 모든 요청 처리 스레드가 공유"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, fail_rate=0.0, fail_status=503, fail_match="", raw_rows=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate        # 0~1, fail_match 에 해당하는 요청 중 실패 비율
+        self.fail_status = fail_status
+        self.fail_match = fail_match      # 경로 부분 문자열 (빈 값 = 전체)
+        self.raw_rows = raw_rows          # 원자재 API 전체 건수 (None = 2020년~)
+
+    def update(self, **values):
+        for key, value in values.items():
+            if key not in vars(self):
+                raise KeyError(key)
+            current = getattr(self, key)
+            if value in ("", "none", "None"):
+                value = "" if isinstance(current, str) else None
+            elif current is None:
+                value = int(value)
+            else:
+                value = type(current)(value)
+            setattr(self, key, value)
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            if server.verbose:
+                super().log_message(fmt, *args)
+
+        def _send(self, status, body, content_type="application/json; charset=utf-8", headers=None):
+            data = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _inject(self, path):
+            """설정된 지연 적용. 실패 주입 대상이면 True (이미 오류 응답함)"""
+            conf = server.config
+            delay = conf.latency_ms + (random.uniform(-conf.jitter_ms, conf.jitter_ms) if conf.jitter_ms else 0)
+            if delay > 0:
+                time.sleep(delay / 1000)
+            if conf.fail_rate and conf.fail_match in path and random.random() < conf.fail_rate:
+                self._send(conf.fail_status, {"error": "injected failure", "path": path})
+                return True
+            return False
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+            if url.path == "/__config":
+                try:
+                    server.config.update(**query)
+                except (KeyError, ValueError) as e:
+                    return self._send(400, {"error": f"bad config: {e}"})
+                return self._send(200, server.config.as_dict())
+            if self._inject(url.path):
+                return
+            if url.path.startswith("/sheets/"):
+                return self._sheet(url.path.removeprefix("/sheets/"))
+            if url.path == "/odcloud":
+                return self._raw_material(query)
+            if url.path == "/oauth/auth":
+                return self._authorize(query)
+            if url.path == "/oauth/userinfo":
+                return self._userinfo()
+            if url.path == "/oauth/certs":
+                return self._send(200, {"keys": [server.signing_key.jwk()]}, headers={"Cache-Control": f"public, max-age={JWKS_MAX_AGE_S}"})
+            self._send(404, {"error": "not found", "path": url.path})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if self._inject(url.path):
+                return
+            if url.path == "/oauth/token":
+                length = int(self.headers.get("Content-Length", 0))
+                form = {k: v[-1] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+                return self._token(form)
+            self._send(404, {"error": "not found", "path": url.path})
+
+        def _sheet(self, name):
+            path = (server.data_dir / name).resolve()
+            if path.parent != server.data_dir.resolve() or not path.is_file():
+                return self._send(404, {"error": "no such sheet", "name": name})
+            self._send(200, path.read_bytes(), "text/csv; charset=utf-8")
+
+        def _raw_material(self, query):
+            rows = raw_material_rows(count=server.config.raw_rows)
+            total = len(rows)
+            # odcloud 조건 검색 중 기간 비교만 (cond[기간::GT]=2024-05)
+            if "cond[기간::GT]" in query:
+                rows = [r for r in rows if r["기간"] > query["cond[기간::GT]"]]
+            if "cond[기간::GTE]" in query:
+                rows = [r for r in rows if r["기간"] >= query["cond[기간::GTE]"]]
+            page, per_page = int(query.get("page", 1)), int(query.get("perPage", 10))
+            chunk = rows[(page - 1) * per_page: page * per_page]
+            self._send(200, {
+                "page": page, "perPage": per_page, "totalCount": total,
+                "currentCount": len(chunk), "matchCount": len(rows), "data": chunk,
+            })
+
+        def _authorize(self, query):
+            # 로그인 화면 없이 바로 redirect_uri?code=... 로 돌려보냄
+            params = {"code": server.issue_code()}
+            if "state" in query:
+                params["state"] = query["state"]
+            redirect = query.get("redirect_uri", "http://localhost:8501")
+            self._send(302, b"", "text/plain", {"Location": f"{redirect}?{urlencode(params)}"})
+
+        def _token(self, form):
+            if form.get("grant_type") == "refresh_token":
+                # refresh token 은 만료 없이 계속 사용 가능 (새 refresh token 은 주지 않음, Google 과 동일)
+                if not form.get("refresh_token", "").startswith("standin-refresh-"):
+                    return self._send(400, {"error": "invalid_grant", "error_description": "Token has been expired or revoked."})
+                return self._send(200, {
+                    "access_token": f"standin-token-{form['refresh_token']}", "expires_in": 3599,
+                    "id_token": server.id_token(form.get("client_id", "")),
+                    "token_type": "Bearer", "scope": "openid email profile",
+                })
+            if not server.redeem_code(form.get("code", "")):
+                return self._send(400, {"error": "invalid_grant", "error_description": "Bad Request"})
+            self._send(200, {
+                "access_token": f"standin-token-{form['code']}", "expires_in": 3599,
+                "refresh_token": f"standin-refresh-{form['code']}",
+                "id_token": server.id_token(form.get("client_id", "")),
+                "token_type": "Bearer", "scope": "openid email profile",
+            })
+
+        def _userinfo(self):
+            if not self.headers.get("Authorization", "").startswith("Bearer standin-token-"):
+                return self._send(401, {"error": "invalid_token"})
+            self._send(200, server.user)
+
+    return Handler
+
+
+class StandinServer:
+    """백그라운드 스레드에서 도는 대체 서버. start() 후 secrets() 를 앱 secrets 로 사용"""
+
+    def __init__(self, data_dir, config=None, host="127.0.0.1", port=0, user=None, verbose=False):
+        self.data_dir = Path(data_dir)
+        self.config = config or StandinConfig()
+        self.user = user or STANDIN_USER
+        self.verbose = verbose
+        self._codes = set()
+        self._codes_lock = threading.Lock()
+        self._issued = 0
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+        self._signing_key = None
+
+    @property
+    def signing_key(self):
+        # 키 생성은 처음 id_token 을 발급할 때
+        with self._codes_lock:
+            if self._signing_key is None:
+                self._signing_key = SigningKey()
+        return self._signing_key
+
+    def id_token(self, client_id, lifetime_s=3600):
+        now = int(time.time())
+        return self.signing_key.sign_jwt({
+            "iss": self.base_url, "aud": client_id, "sub": self.user["id"], "iat": now, "exp": now + lifetime_s,
+            "email": self.user["email"], "email_verified": True,
+            "name": self.user["name"], "picture": self.user["picture"],
+        })
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def issue_code(self):
+        with self._codes_lock:
+            self._issued += 1
+            code = f"standin-code-{self._issued}"
+            self._codes.add(code)
+        return code
+
+    def redeem_code(self, code):
+        # 실제 Google 과 같이 인가 코드는 1회만 교환 가능
+        with self._codes_lock:
+            if code in self._codes:
+                self._codes.remove(code)
+                return True
+        return False
+
+    def serve_forever(self):
+        """현재 스레드에서 실행 (Ctrl+C 로 종료)"""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def sheet_urls(self):
+        """data_dir 의 CSV → secrets [google_sheets] (파일명 target_sa.csv → sa_target_url)"""
+        urls = {}
+        for path in sorted(self.data_dir.glob("*.csv")):
+            parts = path.stem.split("_", 1)
+            key = f"{parts[1]}_{parts[0]}_url" if len(parts) == 2 else f"{path.stem}_url"
+            urls[key] = f"{self.base_url}/sheets/{path.name}"
+        return urls
+
+    def endpoints(self):
+        """secrets [endpoints] (홈.py 외부 API 주소 재정의)"""
+        return {
+            "google_auth_url": f"{self.base_url}/oauth/auth",
+            "google_token_url": f"{self.base_url}/oauth/token",
+            "google_userinfo_url": f"{self.base_url}/oauth/userinfo",
+            "google_jwks_url": f"{self.base_url}/oauth/certs",
+            "google_issuer": self.base_url,
+            "raw_material_url": f"{self.base_url}/odcloud",
+        }
+
+    def secrets(self, redirect_uri="http://localhost:8501"):
+        return {
+            "google_sheets": self.sheet_urls(),
+            "endpoints": self.endpoints(),
+            "google_oauth": {"GOOGLE_CLIENT_ID": "standin", "GOOGLE_CLIENT_SECRET": "standin", "REDIRECT_URI": redirect_uri},
+            "api": {"raw_material_service_key": "standin"},
+            "admin": {"allowed_emails": [self.user["email"]], "admin_emails": [self.user["email"]]},
+            "session": {"secret_key": "standin-session-key"},
+        }
+
+
+def secrets_toml(secrets):
+    lines = []
+    for section, values in secrets.items():
+        lines.append(f"[{section}]")
+        lines += [f"{key} = {json.dumps(value, ensure_ascii=False)}" for key, value in values.items()]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-dir", type=Path, help="CSV 폴더 (없으면 fixtures 로 생성)")
+    parser.add_argument("--scale", type=int, default=1, help="생성할 데이터 크기 배수")
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--jitter-ms", type=int, default=0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--fail-match", default="", help="실패 주입 대상 경로 (예: /sheets/, /oauth/token)")
+    parser.add_argument("--raw-rows", type=int, help="원자재 API 전체 건수")
+    parser.add_argument("--user-email", default=STANDIN_USER["email"])
+    parser.add_argument("--redirect-uri", default="http://localhost:8501")
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="ssp_standin_") as tmp:
+        data_dir = args.data_dir
+        if data_dir is None:
+            data_dir = Path(tmp)
+            write_fixtures(data_dir, scale=args.scale)
+        config = StandinConfig(args.latency_ms, args.jitter_ms, args.fail_rate, args.fail_status, args.fail_match, args.raw_rows)
+        server = StandinServer(
+            data_dir, config, port=args.port,
+            user={**STANDIN_USER, "email": args.user_email}, verbose=args.verbose,
+        )
+        print(f"# 대체 서버: {server.base_url}  (데이터: {data_dir})")
+        print("# 아래 내용을 .streamlit/secrets.toml 에 사용\n")
+        print(secrets_toml(server.secrets(args.redirect_uri)))
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
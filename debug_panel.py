@@ -0,0 +1,111 @@
+# debug_panel.py
+import pandas as pd
+import streamlit as st
+
+from auth import is_admin
+from payload import payload_budget, payload_stats
+from rerun_metrics import rerun_history, set_stage_timing, stage_history
+
+
+def _payload_section():
+    st.markdown("**📦 페이지 전송량**")
+
+    run = st.session_state.get("_payload_last")
+    if run is not None:
+        budget = payload_budget(run.page)
+        st.metric(
+            f"{run.page} (이번 실행)",
+            f"{run.total_bytes / 1024:,.1f} KB",
+            f"예산 {budget / 1024:,.0f} KB 대비 {run.total_bytes / budget:.0%}",
+            delta_color="inverse" if run.total_bytes > budget else "off",
+        )
+        df_run = pd.DataFrame(
+            [(kind, count, size / 1024) for kind, (count, size) in run.by_type.items()],
+            columns=["유형", "개수", "KB"],
+        ).sort_values("KB", ascending=False)
+        st.dataframe(df_run, hide_index=True, use_container_width=True, column_config={
+            "KB": st.column_config.NumberColumn(format="%.1f"),
+        })
+
+    pages = payload_stats().snapshot()
+    if pages:
+        df_pages = pd.DataFrame([
+            {
+                "페이지": name,
+                "실행": page["runs"],
+                "최근 KB": page["last"] / 1024,
+                "평균 KB": page["total"] / page["runs"] / 1024,
+                "최대 KB": page["max"] / 1024,
+            }
+            for name, page in pages.items()
+        ])
+        st.caption("전체 페이지 누적 (서버 기동 이후)")
+        st.dataframe(df_pages, hide_index=True, use_container_width=True, column_config={
+            col: st.column_config.NumberColumn(format="%.1f") for col in ["최근 KB", "평균 KB", "최대 KB"]
+        })
+
+        # 페이지 × 요소 유형별 누적 KB (어느 유형이 전송량을 차지하는지)
+        df_types = pd.DataFrame(
+            {name: {kind: size / 1024 for kind, size in page["by_type"].items()} for name, page in pages.items()}
+        ).T.fillna(0)
+        df_types = df_types[df_types.sum().sort_values(ascending=False).index]
+        st.caption("페이지별 요소 유형 누적 KB")
+        st.dataframe(df_types, use_container_width=True, column_config={
+            col: st.column_config.NumberColumn(format="%.1f") for col in df_types.columns
+        })
+
+
+def _rerun_section():
+    st.markdown("**⏱ 재실행 시간**")
+    history = rerun_history()
+    if not history:
+        st.caption("기록 없음")
+        return
+    # 최신 순. fragment:* 만 이어지면 페이지 전체가 아닌 해당 영역만 재실행된 것
+    df_history = pd.DataFrame(history[::-1], columns=["범위", "초"])
+    st.dataframe(df_history, hide_index=True, use_container_width=True, column_config={
+        "초": st.column_config.NumberColumn(format="%.3f"),
+    })
+
+
+def _stage_section():
+    st.markdown("**🔬 단계별 시간**")
+    enabled = st.toggle("단계별 시간 기록", key="_stage_timing", help="켜면 다음 실행부터 기록 (끄면 부하 없음)")
+    set_stage_timing(enabled)
+    stages = stage_history()
+    if not enabled or not stages:
+        return
+
+    df = pd.DataFrame(stages, columns=["실행", "단계", "깊이", "시작", "초"])
+    df["ms"] = df["초"] * 1000
+
+    # 가장 최근에 끝난 실행(깊이 0 표시가 있는 실행)의 단계를 시작 순으로
+    finished = df[df["깊이"] == 0]
+    if not finished.empty:
+        last = finished.iloc[-1]
+        df_run = df[(df["실행"] == last["실행"]) & (df["깊이"] > 0)].sort_values("시작")
+        df_run = df_run.assign(단계=["· " * (d - 1) + name for d, name in zip(df_run["깊이"], df_run["단계"])])
+        st.caption(f"최근 실행: {last['단계']} {last['ms']:,.0f} ms")
+        st.dataframe(df_run[["단계", "ms"]], hide_index=True, use_container_width=True, column_config={
+            "ms": st.column_config.NumberColumn(format="%.1f"),
+        })
+
+    # 버퍼 전체 단계 유형별 합계 (chart SA2601 → chart)
+    df_stages = df[df["깊이"] > 0].assign(유형=lambda d: d["단계"].str.replace(r" [A-Za-z0-9_]+$", "", regex=True))
+    if not df_stages.empty:
+        df_sum = df_stages.groupby("유형")["ms"].agg(["count", "mean", "max", "sum"]).sort_values("sum", ascending=False)
+        df_sum.columns = ["횟수", "평균 ms", "최대 ms", "합계 ms"]
+        st.caption(f"기록된 단계 {len(df_stages)}개 (최근 {df['실행'].nunique()}회 실행)")
+        st.dataframe(df_sum, use_container_width=True, column_config={
+            col: st.column_config.NumberColumn(format="%.1f") for col in ["평균 ms", "최대 ms", "합계 ms"]
+        })
+
+
+def render_debug_panel():
+    """관리자 전용 사이드바 진단 패널. 관리자가 아니면 아무것도 출력하지 않음"""
+    if not is_admin():
+        return
+    with st.sidebar.expander("🛠 관리자 진단", expanded=False):
+        _payload_section()
+        _rerun_section()
+        _stage_section()
@@ -0,0 +1,479 @@
+# division_page.py
+import os
+import tomllib
+import warnings
+from datetime import datetime
+from html import escape  # 메모/정성 KPI 안전 이스케이프
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+import streamlit as st
+
+from auth import require_login
+from debug_panel import render_debug_panel
+from helpers import frame_version
+from kpi_charts import kpi_figure
+from kpi_data import MONTHS, monthly_cube
+from kpi_overview import render_overview
+from metrics import count_loader, record_loader_miss, start_metrics_exporter, timed_fetch
+from navigation import render_nav
+from page_assets import FOOTER_CSS, FOOTER_HTML, KPI_TABLE_CSS, TEXTUAL_CSS, inject_css
+from payload import finish_payload_meter, start_payload_meter
+from rerun_metrics import timed_fragment, timed_stage
+
+warnings.filterwarnings('ignore')
+
+DIVISIONS_PATH = Path(__file__).with_name("divisions.toml")
+# 대량 데이터 테스트용 설정 사본 (bench/fixtures.py 가 생성). 지정 시 DIVISIONS_PATH 대신 사용
+DIVISIONS_ENV = "SSP_DIVISIONS_TOML"
+
+# divisions.toml 에서 생략 가능한 항목의 기본값
+DIVISION_DEFAULTS = {
+    "textual_layout": "fill",
+    "default_chart": "grouped",
+    "show_cumulative": True,
+    "bar_line_uids": [],
+    "stacked_groups": {},
+    "yearly_goal_text": {},
+    "month_labels": {},
+    "lower_is_better": [],
+}
+
+MONTH_COLUMNS = [f"{m}월" for m in MONTHS]
+
+
+@count_loader("load_divisions")
+@st.cache_data(show_spinner=False)
+def _load_divisions(path, mtime):
+    record_loader_miss("load_divisions")
+    with open(path, "rb") as f:
+        divisions = tomllib.load(f)["divisions"]
+    return {key: {**DIVISION_DEFAULTS, **conf} for key, conf in divisions.items()}
+
+
+def divisions_version():
+    """본부 설정 파일 (경로, 수정 시각): 색인 캐시 키용"""
+    path = Path(os.environ.get(DIVISIONS_ENV) or DIVISIONS_PATH)
+    return str(path), path.stat().st_mtime
+
+
+def load_divisions():
+    """본부 설정 전체 (파일이 바뀌면 다시 읽음)"""
+    return _load_divisions(*divisions_version())
+
+
+@count_loader("load_sheet")
+@st.cache_data(ttl=1800, show_spinner=False)
+def load_sheet(url):
+    record_loader_miss("load_sheet")
+    with timed_stage("load_sheet"), timed_fetch("sheets"):  # 다운로드 + CSV 파싱 (캐시 미스일 때만 기록)
+        df = pd.read_csv(url)
+    df.columns = df.columns.str.strip()
+    # 내용 해시를 함께 캐시: 색인 등 파생 캐시가 매 실행 시트 전체를 해시하지 않고 이 값으로 갱신 여부 판단
+    df.attrs["version"] = frame_version(df)
+    return df
+
+
+def sheet_version(df):
+    """load_sheet 결과의 내용 해시 (시트가 다시 로드돼 내용이 바뀌면 달라짐)"""
+    return df.attrs.get("version")
+
+
+# =========================
+# 표 생성
+# =========================
+def highlight_row_if_diff(row):
+    if not str(row["구분"]).startswith("목표比"):
+        return [''] * len(row)
+    return ['color: blue' if isinstance(v, (int, float)) and v > 0 else
+            'color: red' if isinstance(v, (int, float)) and v < 0 else ''
+            for v in row]
+
+
+def numeric_table(cube, uid, group=None, show_cumulative=True):
+    """정량 KPI 표: 목표/실적/목표比 × 월 (+누적). 상/중/하 그룹이면 구분마다 전체/상/중/하 행"""
+    pairs = [(uid, None)] if group is None else [(uid, '전체')] + list(zip(group['sub_uids'], group['labels']))
+    rows_uid = cube.reindex([row_uid for row_uid, _ in pairs])
+    target = rows_uid["목표"].fillna(0).to_numpy()
+    result = rows_uid["실적"].fillna(0).to_numpy()
+
+    rows = []
+    for name, values in [("목표", target), ("실적", result), ("목표比", result - target)]:
+        for (_, label), row in zip(pairs, values):
+            rows.append([name if label is None else f"{name}({label})", *row, row.sum()])
+    df = pd.DataFrame(rows, columns=["구분", *MONTH_COLUMNS, "누적"])
+    if not show_cumulative:
+        df = df.drop(columns=["누적"])
+    value_cols = df.columns[1:]
+    df[value_cols] = df[value_cols].round(0).astype("Int64")
+    return df
+
+
+def numeric_table_html(df, month_labels=None):
+    if month_labels:
+        df = df.rename(columns=month_labels)
+    format_dict = {col: "{:,.0f}" for col in df.columns[1:]}
+    styled = df.style.apply(highlight_row_if_diff, axis=1).format(format_dict, na_rep="-")
+    return styled.to_html(index=False)
+
+
+def format_text_cell(val):
+    """정성 KPI 셀 텍스트용 포맷: 빈값 -> '-', 줄바꿈 -> <br>, HTML 이스케이프"""
+    if pd.isna(val) or val == "":
+        return "-"
+    s = str(val)
+    s = escape(s)  # <, &, " 등 이스케이프
+    s = (
+        s.replace("\\r\\n", "<br>")
+         .replace("\\n", "<br>")
+         .replace("\r\n", "<br>")
+         .replace("\r", "<br>")
+         .replace("\n", "<br>")
+    )
+    return s
+
+
+def _is_blank(val):
+    return val is None or pd.isna(val) or val == ""
+
+
+def textual_table_html(targets, results):
+    """정성 KPI: 수직 레이아웃 (월 = 행, 목표/실적 = 열). 연속 동일 목표는 rowspan 병합"""
+    # 데이터가 있는 월만 표시
+    visible = [i for i in range(len(MONTHS)) if not (_is_blank(targets[i]) and _is_blank(results[i]))]
+    if not visible:
+        visible = list(range(len(MONTHS)))
+
+    # 목표 열 rowspan 계산 (연속 동일 값 병합)
+    keys = [None if _is_blank(targets[i]) else str(targets[i]) for i in visible]
+    rowspan_info = []  # (span, should_render)
+    i = 0
+    while i < len(visible):
+        j = i + 1
+        if keys[i] is not None:
+            while j < len(visible) and keys[j] == keys[i]:
+                j += 1
+        rowspan_info.append((j - i, True))
+        rowspan_info.extend((j - i, False) for _ in range(i + 1, j))
+        i = j
+
+    html = "<table class='textual-v'><thead><tr><th class='month-col'>월</th><th class='content-col'>목표</th><th class='content-col'>실적</th></tr></thead><tbody>"
+    for idx, m in enumerate(visible):
+        html += f"<tr><td class='month-col'>{MONTH_COLUMNS[m]}</td>"
+        span, should_render = rowspan_info[idx]
+        if should_render:
+            rs = f" rowspan='{span}'" if span > 1 else ""
+            html += f"<td class='content-col'{rs}>{format_text_cell(targets[m])}</td>"
+        html += f"<td class='content-col'>{format_text_cell(results[m])}</td></tr>"
+    html += "</tbody></table>"
+    return html
+
+
+# =========================
+# 본부 데이터 준비 (본부·연도별 1회, 모든 세션 공유)
+# =========================
+@count_loader("load_division")
+@st.cache_data(ttl=1800, show_spinner=False)
+def load_division(conf, year):
+    """당해 목표/실적 → 월별 큐브, 정량·정성 KPI 목록 (데이터만. 표는 load_division_tables)
+
+    전사 요약(전 본부)과 Excel 보고서도 쓰므로 표·HTML 은 만들지 않음
+    """
+    record_loader_miss("load_division")
+    sheets = st.secrets["google_sheets"]
+    df_target = load_sheet(sheets[f"{conf['sheet']}_target_url"])
+    df_result = load_sheet(sheets[f"{conf['sheet']}_result_url"])
+    with timed_stage("year_filter"):
+        df_target = df_target[df_target["년도"] == year]
+        df_result = df_result[df_result["년도"] == year]
+
+    target_by_uid = df_target.drop_duplicates("UID").set_index("UID")
+    groups = conf["stacked_groups"]
+    stacked_sub_uids = {uid for g in groups.values() for uid in g['sub_uids']}
+
+    # 정성 KPI: 월별 첫 행의 목표/실적 문구 그대로
+    textual = []
+    with timed_stage("textual_kpis"):
+        for uid in df_target.loc[df_target["지표 유형"] == "정성", "UID"].unique():
+            df_kpi = df_result[df_result["UID"] == uid].drop_duplicates("월").set_index("월")
+            targets = [df_kpi["목표"].get(m) for m in MONTHS]
+            results = [df_kpi["실적"].get(m) for m in MONTHS]
+            textual.append({
+                "uid": uid,
+                "name": target_by_uid.at[uid, "추진 목표"],
+                "targets": targets,
+                "results": results,
+            })
+
+    # 정량 KPI: 상/중/하 개별 UID는 전체 UID로 통합 표시
+    with timed_stage("monthly_cube"):
+        df_result = df_result.copy()
+        # 빈 값은 NaN 그대로 (미보고 월을 0% 로 보이지 않게). 표·그래프는 각자 0 으로 채움
+        df_result["목표"] = pd.to_numeric(df_result["목표"], errors="coerce")
+        df_result["실적"] = pd.to_numeric(df_result["실적"], errors="coerce")
+        cube = monthly_cube(df_result)
+
+    numeric = []
+    for uid in df_target.loc[df_target["지표 유형"] == "정량", "UID"].unique():
+        if uid in stacked_sub_uids:
+            continue
+        unit = target_by_uid.at[uid, "단위"]
+        yearly_goal = cube["목표"].loc[uid].sum() if uid in cube.index else 0
+        numeric.append({
+            "uid": uid,
+            "name": target_by_uid.at[uid, "추진 목표"],
+            "unit": unit,
+            "yearly_goal_text": conf["yearly_goal_text"].get(uid, f"{int(yearly_goal):,}{unit}"),
+        })
+
+    return {"cube": cube, "numeric": numeric, "textual": textual}
+
+
+@count_loader("load_division_tables")
+@st.cache_data(ttl=1800, show_spinner=False)
+def load_division_tables(conf, year):
+    """본부 페이지용: load_division + 정량 KPI 표(DataFrame·HTML), 정성 KPI 표 HTML"""
+    record_loader_miss("load_division_tables")
+    data = load_division(conf, year)
+    groups = conf["stacked_groups"]
+    for kpi in data["numeric"]:
+        with timed_stage("numeric_table"):
+            kpi["table"] = numeric_table(data["cube"], kpi["uid"], groups.get(kpi["uid"]), conf["show_cumulative"])
+        with timed_stage("styler_html"):
+            kpi["html"] = numeric_table_html(kpi["table"], conf["month_labels"].get(kpi["uid"]))
+    with timed_stage("textual_tables"):
+        for kpi in data["textual"]:
+            kpi["html"] = textual_table_html(kpi["targets"], kpi["results"])
+    return data
+
+
+# =========================
+# 화면 구성
+# =========================
+def _chart_style(conf, uid):
+    if uid in conf["stacked_groups"]:
+        return "stacked"
+    if uid in conf["bar_line_uids"]:
+        return "bar_line"
+    return conf["default_chart"]
+
+
+def render_numeric_kpi(conf, cube, kpi, number):
+    uid = kpi["uid"]
+    st.markdown(f"<h6>{number}. {kpi['name']}</h6>", unsafe_allow_html=True)
+
+    # 월별 큐브 조각 → 공통 템플릿 그래프 (같은 데이터면 만들어 둔 Figure 재사용)
+    group = conf["stacked_groups"].get(uid, {})
+    with timed_stage(f"chart {uid}"):  # Figure 생성(캐시) + 직렬화·전송
+        fig = kpi_figure(
+            cube, uid, kpi["unit"], _chart_style(conf, uid),
+            group.get('sub_uids', ()), group.get('labels', ()),
+        )
+        st.plotly_chart(fig, use_container_width=True, key=f"plot_{uid}")
+
+    # 왼쪽은 연간목표, 오른쪽은 단위 표시 (한 줄에)
+    st.markdown(
+        f"""
+        <div style='display:flex; justify-content:space-between; font-size:13px; font-weight:500; margin-bottom:2px;'>
+            <div style='color:#666;'>[연간목표 : {kpi['yearly_goal_text']}]</div>
+            <div style='color:#666;'>[단위: {kpi['unit']}]</div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    with timed_stage(f"table {uid}"):
+        st.markdown(f"<div style='overflow-x:auto'>{kpi['html']}</div>", unsafe_allow_html=True)
+
+
+def render_textual_kpi(kpi, number):
+    st.markdown(f"<h6>{number}. {kpi['name']}</h6>", unsafe_allow_html=True)
+    with timed_stage(f"table {kpi['uid']}"):
+        st.markdown(f"<div style='overflow-x:auto'>{kpi['html']}</div>", unsafe_allow_html=True)
+
+
+def render_two_columns(cells, number):
+    """(렌더 함수, 인자) 목록을 2열로 배치. 다음 번호 반환"""
+    for i in range(0, len(cells), 2):
+        for col, (render, args) in zip(st.columns(2), cells[i:i + 2]):
+            with col:
+                render(*args, number)
+            number += 1
+    return number
+
+
+def render_kpis(conf, cube, numeric, textual):
+    """정량 KPI 2열 → 정성 KPI (textual_layout 에 따라 배치). 번호는 정량부터 이어서"""
+    layout = conf["textual_layout"]
+    cells = [(render_numeric_kpi, (conf, cube, kpi)) for kpi in numeric]
+    if layout == "fill" and len(cells) % 2 == 1 and textual:
+        cells.append((render_textual_kpi, (textual[0],)))  # 정량 마지막 줄 빈칸
+        textual = textual[1:]
+    number = render_two_columns(cells, 1)
+
+    if layout == "grid":
+        render_two_columns([(render_textual_kpi, (kpi,)) for kpi in textual], number)
+        return
+    for kpi in textual:
+        render_textual_kpi(kpi, number)
+        number += 1
+
+
+# =========================
+# 메모 색인: (본부 key, 년도, 월) → 메모 목록. 시트 로드 후 한 번 만들어 조회는 dict 1회
+# =========================
+class Memo(NamedTuple):
+    writer: str  # HTML 이스케이프 완료
+    text: str
+
+
+def _escaped(val):
+    return "" if val is None or pd.isna(val) else escape(str(val))
+
+
+def memo_mask(df_memo, conf):
+    """본부 메모 행 여부. 본부 칸에 conf["memo"] 가 들어 있으면 해당 (str.contains, 정규식).
+    본부 페이지·Excel 보고서·검색이 같은 규칙을 씀"""
+    return df_memo["본부"].astype("string").str.contains(conf["memo"], na=False).to_numpy(dtype=bool)
+
+
+class MemoIndex:
+    def __init__(self, divisions, df_memo):
+        self._memos = {}
+        for key, conf in divisions.items():  # 여러 본부에 해당하는 메모는 각 본부에 모두
+            for row in df_memo[memo_mask(df_memo, conf)].to_dict("records"):
+                try:
+                    year, month = int(row["년도"]), int(row["월"])
+                except (TypeError, ValueError):
+                    continue  # 년도·월이 비어 있는 행
+                memo = Memo(_escaped(row.get("입력자")), _escaped(row.get("메모")))
+                self._memos.setdefault((key, year, month), []).append(memo)
+        # 본부별 메모가 있는 (년도, 월), 최신순
+        self._months = {}
+        for key, year, month in self._memos:
+            self._months.setdefault(key, []).append((year, month))
+        for months in self._months.values():
+            months.sort(reverse=True)
+
+    def get(self, key, year, month):
+        return self._memos.get((key, year, month), [])
+
+    def months(self, key):
+        return self._months.get(key, [])
+
+
+# 캐시 키 = 본부 설정 파일 + 메모 시트 내용 해시: 시트가 갱신되거나 divisions.toml 이 바뀌면 다시 만듦.
+# 데이터 자체(_ 인자)는 해시하지 않음. 읽기 전용으로 모든 세션이 공유
+@count_loader("memo_index")
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_memo_index(_divisions, _df_memo, version):
+    record_loader_miss("memo_index")
+    return MemoIndex(_divisions, _df_memo)
+
+
+def build_memo_index():
+    df_memo = load_sheet(st.secrets["google_sheets"]["memo_url"])
+    return _build_memo_index(load_divisions(), df_memo, (divisions_version(), sheet_version(df_memo)))
+
+
+def _month_label(year_month, this_year):
+    year, month = year_month
+    return f"{month}월" if year == this_year else f"{year}년 {month}월"
+
+
+# 메모 영역은 프래그먼트: 메모 관련 조작(지난 달 선택 등) 시 페이지 전체가 아닌 이 영역만 재실행
+@timed_fragment("메모")
+def render_memo_section(key, year, month):
+    index = build_memo_index()
+    # 이번 달(메모가 없어도) + 메모가 있는 지난 달들 (미리 입력된 다음 달 이후는 제외)
+    options = sorted({(year, month), *(ym for ym in index.months(key) if ym <= (year, month))}, reverse=True)
+    title_col, picker_col = st.columns([3, 1])
+    with picker_col:
+        selected = st.selectbox(
+            "메모 월", options, index=options.index((year, month)), key="memo_month",
+            format_func=lambda ym: _month_label(ym, year), label_visibility="collapsed",
+        )
+    with title_col:
+        st.markdown(f"<h4>📝 {_month_label(selected, year)} 메모</h4>", unsafe_allow_html=True)
+
+    with timed_stage("memo_lookup"):
+        selected_memo = index.get(key, *selected)
+
+    # 메모 출력: 줄바꿈/여러 칸 띄어쓰기 그대로 보존 (white-space: pre-wrap)
+    with timed_stage("memo_render"):
+        if selected_memo:
+            for writer, memo_text in selected_memo:
+                st.markdown(
+                    f"""
+                    <div style='margin-bottom: 12px; padding: 10px; background-color: #eef5ff; border-left: 5px solid #3a7bd5;'>
+                        <div style='margin-bottom:6px; color:#333;'>입력자 : <strong>{writer}</strong></div>
+                        <div style='white-space: pre-wrap; font-weight:600;'>{memo_text}</div>
+                    </div>
+                    """,
+                    unsafe_allow_html=True
+                )
+        else:
+            st.info("해당 월의 메모가 없습니다.")
+
+
+def focused_uid():
+    """검색에서 넘어온 KPI UID. 주소(?kpi=UID)에 남겨 새로고침·공유해도 유지"""
+    uid = st.session_state.pop("focus_kpi", None)
+    if uid:
+        st.query_params["kpi"] = uid
+    return st.query_params.get("kpi")
+
+
+def render_division_page(key):
+    """본부 페이지 공통 렌더러. key = divisions.toml 의 [divisions.<key>]"""
+    st.set_page_config(layout="wide", initial_sidebar_state="collapsed")
+    start_metrics_exporter()  # secrets [metrics] 설정 시 프로세스당 1회
+
+    require_login(division=key)  # 로그인·본부 권한이 없으면 여기서 차단됨 (데이터 로드 전)
+    divisions = load_divisions()
+    conf = divisions[key]
+    render_nav(divisions)
+    start_payload_meter(conf["name"])  # 이번 실행의 전송량(요소별 직렬화 크기) 기록
+
+    # 현재 연도 및 월 정보
+    this_year = datetime.today().year
+    current_month = datetime.today().month
+
+    with timed_stage("load_division"):  # 캐시 적중이면 복사 비용만
+        data = load_division_tables(conf, this_year)
+    numeric, textual = data["numeric"], data["textual"]
+
+    st.markdown(f"### {this_year}년 {conf['name']} 주요 추진 목표")
+
+    # 페이지 CSS는 여기서 한 번만 주입 (표마다 반복 전송하지 않음)
+    inject_css(KPI_TABLE_CSS, TEXTUAL_CSS, FOOTER_CSS)
+
+    # 보기 방식: 개요 = 정량 KPI 전체 달성률 히트맵 1개 (셀 클릭 시 해당 KPI 상세만 표시)
+    view_mode = st.radio("보기 방식", ["상세", "개요"], horizontal=True, key="view_mode", label_visibility="collapsed")
+    if view_mode == "개요":
+        selected_uid = render_overview(
+            data["cube"], [(kpi["uid"], kpi["name"]) for kpi in numeric], lower_is_better=conf["lower_is_better"],
+        )
+        numeric = [kpi for kpi in numeric if kpi["uid"] == selected_uid]
+        textual = []
+    elif (focus := focused_uid()) in {kpi["uid"] for kpi in numeric + textual}:
+        # 검색 결과 링크(?kpi=UID): 해당 KPI만 표시
+        numeric = [kpi for kpi in numeric if kpi["uid"] == focus]
+        textual = [kpi for kpi in textual if kpi["uid"] == focus]
+        if st.button(f"🔍 {focus} 만 표시 중 · 전체 KPI 보기", key="clear_focus"):
+            del st.query_params["kpi"]
+            st.rerun()
+
+    with timed_stage("kpis"):
+        render_kpis(conf, data["cube"], numeric, textual)
+
+    # 메모 표시
+    st.markdown("---")
+    render_memo_section(key, this_year, current_month)
+
+    # Footer 출력
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+
+    # 전송량 집계 (예산 초과 시 경고 로그) + 관리자 진단 패널
+    finish_payload_meter()
+    render_debug_panel()
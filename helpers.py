@@ -0,0 +1,52 @@
+# helpers.py
+import base64
+import functools
+import hashlib
+import os
+import threading
+
+import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+
+def with_script_ctx(fn):
+    """현재 실행의 ScriptRunContext 를 붙여 워커 스레드에서 fn 실행 (st.cache_* · st.secrets 사용 가능).
+    스크립트 스레드에서 감싸고, 감싼 함수를 스레드 풀에 넘김"""
+    ctx = get_script_run_ctx()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args, **kwargs)
+
+    return run
+
+
+
+def replace_atomically(path, write):
+    """write(임시 경로) 로 쓴 뒤 path 로 교체: 다른 프로세스가 쓰다 만 파일을 읽지 않음. 실패(OSError 등)는 그대로 전파"""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def b64url_encode(data):
+    """패딩 없는 base64url (JWT·서명 토큰 형식)"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def b64url_decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def frame_version(df):
+    """DataFrame 내용 해시 (열 이름 포함). 로더가 캐시 미스 때 계산해 두고 파생 캐시의 키로 사용"""
+    content = pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+    return hashlib.sha1(repr(list(df.columns)).encode() + content).hexdigest()
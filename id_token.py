@@ -0,0 +1,89 @@
+# id_token.py
+import logging
+import re
+import threading
+import time
+
+import jwt
+import requests as py_requests
+import streamlit as st
+
+from metrics import timed_fetch
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+JWKS_DEFAULT_TTL_S = 3600   # Cache-Control 이 없을 때
+LEEWAY_S = 60               # 서버 간 시계 오차 허용
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class IdTokenError(ValueError):
+    pass
+
+
+# =========================
+# 서명 키 (JWKS): 프로세스 메모리에만 캐시 (디스크에 두면 다른 사용자가 키를 심을 수 있음).
+# 만료는 응답의 Cache-Control max-age
+# =========================
+@st.cache_resource
+def _jwks_memory():
+    return {}, threading.Lock()   # url → {"keys": {kid: jwk}, "expires_at": epoch}
+
+
+def _fetch_jwks(jwks_url):
+    with timed_fetch("google_jwks"):
+        response = py_requests.get(jwks_url, timeout=10)
+        response.raise_for_status()
+    match = _MAX_AGE.search(response.headers.get("Cache-Control", ""))
+    ttl = int(match.group(1)) if match else JWKS_DEFAULT_TTL_S
+    try:
+        keys = {k["kid"]: k for k in response.json()["keys"] if k.get("kty") == "RSA"}
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        raise IdTokenError(f"JWKS 형식 오류: {e!r}") from e
+    return {"keys": keys, "expires_at": time.time() + ttl}
+
+
+def signing_keys(jwks_url, force=False):
+    """kid → JWK. 만료 전이면 네트워크 호출 없음. 형식이 잘못된 응답은 IdTokenError"""
+    memory, lock = _jwks_memory()
+    with lock:
+        entry = memory.get(jwks_url)
+        if not force and entry and entry["expires_at"] > time.time():
+            return entry["keys"]
+        entry = _fetch_jwks(jwks_url)
+        memory[jwks_url] = entry
+        return entry["keys"]
+
+
+def verify_id_token(token, audience, jwks_url=GOOGLE_JWKS_URL, issuers=GOOGLE_ISSUERS):
+    """서명(RS256)·발급자·대상·만료 검증(PyJWT) 후 클레임 반환. 형식 오류를 포함한 모든 실패는 IdTokenError"""
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except jwt.PyJWTError as e:
+        raise IdTokenError(f"id_token 형식 오류: {e}") from e
+    if not isinstance(kid, str):
+        raise IdTokenError(f"id_token 헤더에 kid 없음: {kid!r}")
+
+    keys = signing_keys(jwks_url)
+    if kid not in keys:
+        keys = signing_keys(jwks_url, force=True)  # 키 교체 직후
+    if kid not in keys:
+        raise IdTokenError(f"알 수 없는 서명 키: {kid}")
+    try:
+        key = jwt.PyJWK(keys[kid], algorithm="RS256").key
+        claims = jwt.decode(
+            token, key, algorithms=["RS256"], audience=audience, issuer=list(issuers), leeway=LEEWAY_S,
+            options={"require": ["exp", "iat", "iss", "aud"]},
+        )
+    except (jwt.PyJWTError, KeyError, TypeError, ValueError) as e:   # 키·클레임 형식 오류 포함
+        raise IdTokenError(f"id_token 검증 실패: {e!r}") from e
+    if not claims.get("email") or claims.get("email_verified") is False:
+        raise IdTokenError("확인된 이메일 없음")
+    return claims
+
+
+def user_from_claims(claims):
+    return {"email": claims["email"], "name": claims.get("name", ""), "picture": claims.get("picture", "")}
@@ -0,0 +1,141 @@
+# kpi_charts.py
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from metrics import count_loader, record_loader_miss
+
+# 본부 페이지 KPI 그래프 공통 레이아웃. 템플릿이 아닌 Figure 레이아웃에 직접 넣음
+# (st.plotly_chart 의 streamlit 테마가 템플릿을 덮어쓰므로 템플릿 값은 적용되지 않음)
+LAYOUT = dict(
+    height=250,
+    margin=dict(t=30, b=20),
+    xaxis=dict(tickmode='linear', tick0=1, dtick=1),
+    legend=dict(orientation="h", yanchor="bottom", y=1.1, xanchor="center", x=0.5),
+    plot_bgcolor="#fafafa",
+)
+
+# 누적 선용 보조 y축
+Y2 = dict(overlaying='y', side='right', showgrid=False)
+
+# 상/중/하 스택: 하→중→상 순으로 추가해야 상이 맨 위에 쌓임
+TARGET_COLORS = ['#5dade2', '#1a6b9a', '#0d1b2a']   # 하→중→상 연→중→진 블루
+RESULT_COLORS = ['#f1948a', '#e74c3c', '#7b241c']   # 하→중→상 연→중→진 레드
+
+
+def _bar(x, y, name, color, unit, **kwargs):
+    return go.Bar(
+        x=x, y=y, name=name, marker_color=color,
+        hovertemplate=f'%{{y:,.0f}}{unit}, {name}<extra></extra>',
+        **kwargs,
+    )
+
+
+def _line(x, y, name, color, unit, width=2, marker_width=2, **kwargs):
+    return go.Scatter(
+        x=x, y=y, name=name, mode="lines+markers",
+        line=dict(color=color, width=width),
+        marker=dict(color="#ffffff", line=dict(color=color, width=marker_width), size=6),
+        hovertemplate=f'%{{y:,.0f}}{unit}, {name}<extra></extra>',
+        **kwargs,
+    )
+
+
+def _arrays(series):
+    # 캐시 키용 튜플 → ndarray (plotly가 base64로 압축 직렬화)
+    months, target, result = series
+    return np.array(months, dtype=int), np.array(target, dtype=float), np.array(result, dtype=float)
+
+
+def _cumulative_lines(series, unit):
+    months, target, result = _arrays(series)
+    return [
+        _line(months, np.cumsum(target), "누적 목표", "#ff7f0e", unit, width=2.5, marker_width=1.5, yaxis="y2"),
+        _line(months, np.cumsum(result), "누적 실적", "#e31a1c", unit, width=2.5, marker_width=1.5, yaxis="y2"),
+    ]
+
+
+def _figure(traces, **layout):
+    return go.Figure(data=traces, layout=LAYOUT).update_layout(**layout)
+
+
+def stacked_figure(total, subs, labels, unit):
+    """상/중/하 스택 막대(목표·실적) + 전체 누적 선"""
+    pairs = [(_arrays(sub), label) for sub, label in zip(reversed(subs), reversed(labels))]
+    traces = [
+        _bar(months, target, f"목표({label})", TARGET_COLORS[k], unit, offsetgroup=0)
+        for k, ((months, target, _), label) in enumerate(pairs)
+    ] + [
+        _bar(months, result, f"실적({label})", RESULT_COLORS[k], unit, offsetgroup=1)
+        for k, ((months, _, result), label) in enumerate(pairs)
+    ]
+    return _figure(traces + _cumulative_lines(total, unit), barmode='relative', yaxis2=Y2)
+
+
+def bar_line_figure(series, unit):
+    """실적=막대, 목표=선, 누적 없음"""
+    months, target, result = _arrays(series)
+    return _figure([
+        _bar(months, result, "월별 실적", "#e74c3c", unit),
+        _line(months, target, "월별 목표", "#1a6b9a", unit),
+    ], barmode='group')
+
+
+def grouped_figure(series, unit):
+    """월별 목표/실적 막대 + 누적 선 (기본형)"""
+    months, target, result = _arrays(series)
+    return _figure([
+        _bar(months, target, "월별 목표", "#333f50", unit),
+        _bar(months, result, "월별 실적", "#8497b0", unit),
+    ] + _cumulative_lines(series, unit), barmode='group', yaxis2=Y2)
+
+
+def line_figure(series, unit):
+    """월별 목표/실적 선, 누적 없음 (운영기획본부 기본형)"""
+    months, target, result = _arrays(series)
+    return _figure([
+        _line(months, target, "월별 목표", "#333f50", unit),
+        _line(months, result, "월별 실적", "#8497b0", unit),
+    ], barmode='group')
+
+
+FACTORIES = {
+    "bar_line": bar_line_figure,
+    "grouped": grouped_figure,
+    "lines": line_figure,
+}
+
+
+def monthly_series(cube, uid):
+    """월별 큐브에서 UID 1개 조각 → (월, 목표, 실적) 튜플. 입력 행이 없는 월은 제외, 행은 있는데 값이 빈 월은 0"""
+    if uid not in cube.index:
+        return (), (), ()
+    row = cube.loc[uid]
+    target, result = row["목표"], row["실적"]
+    present = row["입력"].notna().to_numpy()
+    return (
+        tuple(int(m) for m in target.index[present]),
+        tuple(float(v) for v in target[present].fillna(0)),
+        tuple(float(v) for v in result[present].fillna(0)),
+    )
+
+
+@count_loader("kpi_figure")
+@st.cache_resource(max_entries=1024, show_spinner=False)
+def _cached_figure(style, unit, series, labels):
+    record_loader_miss("kpi_figure")
+    # 키가 데이터 자체(튜플)라 값이 바뀌면 새로 생성. Figure는 재실행·세션 간 그대로 공유(수정 금지)
+    if style == "stacked":
+        return stacked_figure(series[0], series[1:], labels, unit)
+    return FACTORIES[style](series[0], unit)
+
+
+def kpi_figure(cube, uid, unit, style="grouped", sub_uids=(), labels=()):
+    """월별 큐브 조각으로 KPI 그래프 1개 생성. 같은 데이터면 이미 만든 Figure 재사용
+
+    style: grouped(기본) / bar_line / lines / stacked(sub_uids·labels 필요)
+    """
+    unit = "" if pd.isna(unit) else str(unit)
+    series = tuple(monthly_series(cube, u) for u in (uid, *sub_uids))
+    return _cached_figure(style, unit, series, tuple(labels))
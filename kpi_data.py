@@ -0,0 +1,54 @@
+# kpi_data.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+MONTHS = list(range(1, 13))
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def monthly_cube(df_result):
+    """UID × (목표/실적/입력, 1~12월) 합계 표. 입력 행이 없거나 값이 비어 있는 월(아직 미보고 실적 등)은 NaN, 입력 = 행 수"""
+    month = pd.to_numeric(df_result["월"], errors="coerce")
+    df = df_result[month.between(1, 12)]
+    values = df[["목표", "실적"]].apply(pd.to_numeric, errors="coerce")
+    grouped = values.groupby([df["UID"], month[month.between(1, 12)].astype(int)])
+    # 입력 = 해당 월의 입력 행 수 (그래프는 값이 비어도 행이 있는 월은 0으로 표시)
+    cube = grouped.sum(min_count=1).assign(입력=grouped.size()).unstack()
+    columns = pd.MultiIndex.from_product([["목표", "실적", "입력"], MONTHS])
+    return cube.reindex(columns=columns)
+
+
+def achievement_matrix(cube, uids, lower_is_better=()):
+    """UID × 월 달성률(실적/목표, lower_is_better 는 목표/실적). 분모가 0이거나 목표·실적이 없는 월은 NaN"""
+    cube = cube.reindex(uids)
+    target = cube["목표"].to_numpy(dtype=float)
+    result = cube["실적"].to_numpy(dtype=float)
+    lower = np.isin(uids, list(lower_is_better))[:, None]
+    numerator = np.where(lower, target, result)
+    denominator = np.where(lower, result, target)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(denominator != 0, numerator / denominator, np.nan)
+    return pd.DataFrame(ratio, index=uids, columns=MONTHS)
+
+
+def cumulative_achievement(cube, uids, month, snapshot_uids=(), lower_is_better=()):
+    """UID별 기준월까지 목표/실적, 차이, 달성률.
+
+    기본은 1~month월 누계. snapshot_uids(재고 등 잔량형)는 month월 값만 비교.
+    lower_is_better 는 달성률 = 목표/실적. 분모가 0이면 달성률 NaN
+    """
+    cube = cube.reindex(uids)
+    upto = [m for m in MONTHS if m <= month]
+    target = cube["목표"][upto].sum(axis=1)
+    result = cube["실적"][upto].sum(axis=1)
+
+    snapshot = cube.index.isin(list(snapshot_uids))
+    target[snapshot] = cube["목표"][month].fillna(0)[snapshot]
+    result[snapshot] = cube["실적"][month].fillna(0)[snapshot]
+
+    lower = cube.index.isin(list(lower_is_better))
+    numerator = result.where(~lower, target)
+    denominator = target.where(~lower, result)
+    ratio = numerator / denominator.where(denominator != 0)
+    return pd.DataFrame({"목표": target, "실적": result, "차이": result - target, "달성률": ratio})
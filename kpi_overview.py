@@ -0,0 +1,89 @@
+# kpi_overview.py
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from kpi_data import MONTHS, achievement_matrix
+
+
+def build_overview_figure(ratio, labels, uids):
+    """KPI × 월 달성률 히트맵 (100% 기준 빨강 → 파랑) + 클릭용 투명 점 레이어
+
+    Heatmap 은 plotly 선택(클릭) 대상이 아니므로, 같은 칸마다 보이지 않는 Scatter 점을 겹쳐
+    st.plotly_chart 선택 이벤트를 받음. 점의 customdata = [UID, 달성률 문구]
+    """
+    z = ratio.to_numpy() * 100
+    text = np.where(np.isnan(z), "", np.char.add(np.nan_to_num(z).round(0).astype(int).astype(str), "%"))
+    months = [f"{m}월" for m in MONTHS]
+
+    heatmap = go.Heatmap(
+        z=z,
+        x=months,
+        y=labels,
+        text=text,
+        texttemplate="%{text}",
+        colorscale="RdBu",
+        zmid=100,
+        zmin=0,
+        zmax=200,
+        xgap=2,
+        ygap=2,
+        colorbar=dict(title="달성률(%)", thickness=12),
+        hoverinfo="skip",  # 안내·클릭은 위의 점 레이어가 담당
+    )
+    rows, cols = np.indices(z.shape)
+    rows, cols = rows.ravel(), cols.ravel()
+    cells = go.Scatter(
+        x=np.array(months)[cols],
+        y=np.array(labels, dtype=object)[rows],
+        customdata=np.column_stack([np.array(uids, dtype=object)[rows], np.where(text[rows, cols] == "", "-", text[rows, cols])]),
+        mode="markers",
+        marker=dict(symbol="square", size=26, opacity=0),
+        selected=dict(marker=dict(opacity=0)),
+        unselected=dict(marker=dict(opacity=0)),
+        showlegend=False,
+        hovertemplate="%{y}<br>%{x} 달성률 %{customdata[1]}<extra></extra>",
+    )
+
+    fig = go.Figure([heatmap, cells])
+    fig.update_layout(
+        height=max(250, 32 * len(labels) + 80),
+        margin=dict(t=30, b=20),
+        yaxis=dict(autorange="reversed"),
+        plot_bgcolor="#fafafa",
+    )
+    return fig
+
+
+def selected_uid(points, uids):
+    """st.plotly_chart 선택 점 → UID (점 레이어의 customdata[0]). 없거나 모르는 값이면 None"""
+    for point in points:
+        custom = point.get("customdata")
+        uid = custom[0] if isinstance(custom, (list, tuple)) and custom else custom
+        if uid in uids:
+            return uid
+    return None
+
+
+def render_overview(cube, kpis, key="kpi_overview", lower_is_better=()):
+    """정량 KPI 전체를 히트맵 1개로 출력하고, 클릭된 셀의 UID를 반환 (없으면 None)
+
+    cube: kpi_data.monthly_cube() 결과. 실적 미보고 월은 빈 칸, lower_is_better 는 목표/실적 (파랑 = 좋음)
+    """
+    if not kpis:
+        return None
+
+    uids = [uid for uid, _ in kpis]
+    labels = [f"{n}. {name}" for n, (_, name) in enumerate(kpis, start=1)]
+
+    ratio = achievement_matrix(cube, uids, lower_is_better)
+    event = st.plotly_chart(
+        build_overview_figure(ratio, labels, uids),
+        use_container_width=True,
+        key=key,
+        on_select="rerun",
+        selection_mode="points",
+    )
+    st.caption("셀을 클릭하면 해당 KPI의 상세 그래프와 표가 아래에 표시됩니다.")
+
+    return selected_uid(event.selection.points if event else [], uids)
@@ -0,0 +1,213 @@
+# kpi_search.py
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import pandas as pd
+import streamlit as st
+
+from auth import can_view_division
+from division_page import divisions_version, load_divisions, load_sheet, memo_mask, sheet_version
+from helpers import with_script_ctx
+from metrics import count_loader, record_loader_miss
+from rerun_metrics import timed_fragment
+
+NGRAM = 2           # 2글자 n-gram (한글은 띄어쓰기·조사와 무관하게 부분 일치)
+MAX_RESULTS = 30
+SNIPPET_WIDTH = 40  # 일치 위치 앞뒤로 보여줄 글자 수
+KIND_ORDER = {"KPI": 0, "정성": 1, "메모": 2}
+
+_SPACE = re.compile(r"\s+")
+
+
+class SearchDoc(NamedTuple):
+    kind: str       # KPI / 정성 / 메모
+    division: str   # divisions.toml 의 본부 key
+    year: int
+    month: int      # KPI 문서는 0
+    uid: str
+    title: str
+    text: str       # 원문 (미리보기용)
+
+
+def normalize(text):
+    """검색용 정규화: 소문자, 공백 제거 (띄어쓰기가 달라도 일치)"""
+    return _SPACE.sub("", str(text)).lower()
+
+
+def ngrams(text):
+    """정규화된 문자열의 n-gram 집합. n보다 짧으면 문자열 자체"""
+    if len(text) < NGRAM:
+        return {text} if text else set()
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def _text(val):
+    return "" if val is None or pd.isna(val) else str(val)
+
+
+class SearchIndex:
+    """문서 목록 + n-gram 역색인 (n-gram → 문서 번호 집합). 1글자 검색용 글자 색인 포함"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self._normalized = []
+        self._grams = {}
+        self._chars = {}
+        for doc_id, doc in enumerate(docs):
+            text = normalize(f"{doc.uid} {doc.title} {doc.text}")
+            self._normalized.append(text)
+            for gram in ngrams(text):
+                self._grams.setdefault(gram, set()).add(doc_id)
+            for char in set(text):
+                self._chars.setdefault(char, set()).add(doc_id)
+
+    def search(self, query, limit=MAX_RESULTS, division_filter=None):
+        q = normalize(query)
+        if not q:
+            return []
+        if len(q) < NGRAM:
+            candidates = self._chars.get(q, set())
+        else:
+            postings = sorted((self._grams.get(gram, set()) for gram in ngrams(q)), key=len)
+            candidates = set.intersection(*postings) if postings[0] else set()
+        # n-gram 교집합은 후보일 뿐이므로 원문 연속 일치로 확정
+        hits = [i for i in candidates if q in self._normalized[i]]
+        if division_filter is not None:
+            hits = [i for i in hits if division_filter(self.docs[i].division)]
+        hits.sort(key=lambda i: (KIND_ORDER[self.docs[i].kind], -self.docs[i].year, self.docs[i].division, self.docs[i].uid, self.docs[i].month))
+        return [self.docs[i] for i in hits[:limit]]
+
+
+def _valid_periods(df, columns):
+    """년도·월 열을 정수로. 빈칸·숫자가 아닌 행은 제외 (한 행 때문에 색인 전체가 실패하지 않게)"""
+    df = df.assign(**{col: pd.to_numeric(df[col], errors="coerce") for col in columns})
+    df = df.dropna(subset=columns)
+    return df.astype({col: int for col in columns})
+
+
+def _division_docs(key, df_target, df_result):
+    df_target = _valid_periods(df_target, ["년도"])
+    df_result = _valid_periods(df_result, ["년도", "월"])
+    docs = []
+    titles = {}
+    for _, row in df_target.drop_duplicates(["년도", "UID"]).iterrows():
+        year, uid = int(row["년도"]), str(row["UID"])
+        title = _text(row["추진 목표"])
+        titles[(year, uid)] = title
+        docs.append(SearchDoc("KPI", key, year, 0, uid, title, ""))
+
+    # 정성 KPI 목표/실적 문구 (월별)
+    textual = df_target.loc[df_target["지표 유형"] == "정성", ["년도", "UID"]]
+    textual_keys = set(zip(textual["년도"].astype(int), textual["UID"].astype(str)))
+    for _, row in df_result.iterrows():
+        year, uid = int(row["년도"]), str(row["UID"])
+        if (year, uid) not in textual_keys:
+            continue
+        text = " / ".join(t for t in (_text(row["목표"]), _text(row["실적"])) if t)
+        if text:
+            docs.append(SearchDoc("정성", key, year, int(row["월"]), uid, titles.get((year, uid), ""), text))
+    return docs
+
+
+def _memo_docs(divisions, df_memo):
+    df_memo = _valid_periods(df_memo, ["년도", "월"])
+    docs = []
+    for key, conf in divisions.items():  # 본부 페이지와 같은 규칙, 여러 본부에 해당하면 각 본부 문서로
+        for _, row in df_memo[memo_mask(df_memo, conf)].iterrows():
+            docs.append(SearchDoc("메모", key, int(row["년도"]), int(row["월"]), "", _text(row.get("입력자")), _text(row.get("메모"))))
+    return docs
+
+
+@st.cache_resource
+def _load_pool():
+    # 시트 동시 로드용, 프로세스 전체가 공유 (실행마다 스레드를 새로 만들지 않음)
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="search-load")
+
+
+def _search_sources():
+    """본부 설정, 본부 key → (목표, 실적) 시트, 메모 시트. 시트는 load_sheet 캐시에서 동시에"""
+    divisions = load_divisions()
+    sheets = st.secrets["google_sheets"]
+    load = with_script_ctx(load_sheet)
+    pool = _load_pool()
+    frames = {
+        key: (pool.submit(load, sheets[f"{conf['sheet']}_target_url"]), pool.submit(load, sheets[f"{conf['sheet']}_result_url"]))
+        for key, conf in divisions.items()
+    }
+    memo = pool.submit(load, sheets["memo_url"])
+    frames = {key: (target.result(), result.result()) for key, (target, result) in frames.items()}
+    return divisions, frames, memo.result()
+
+
+# 캐시 키 = 본부 설정 파일 + 시트별 내용 해시(load_sheet 가 로드할 때 계산): 시트가 다시 로드돼 내용이 바뀌면 다시 만듦.
+# 데이터 자체(_ 인자)는 해시하지 않음. 읽기 전용으로 모든 세션이 공유
+@count_loader("search_index")
+@st.cache_resource(max_entries=2, show_spinner="검색 색인 생성 중...")
+def _build_search_index(_divisions, _frames, _df_memo, version):
+    record_loader_miss("search_index")
+    docs = []
+    for key, (df_target, df_result) in _frames.items():
+        docs += _division_docs(key, df_target, df_result)
+    docs += _memo_docs(_divisions, _df_memo)
+    return SearchIndex(docs)
+
+
+def build_search_index():
+    """전 본부·전 연도의 추진 목표/UID/정성 목표·실적/메모 → SearchIndex. 페이지 로드 때(검색 전) 호출"""
+    divisions, frames, df_memo = _search_sources()
+    version = (
+        divisions_version(),
+        tuple((key, sheet_version(target), sheet_version(result)) for key, (target, result) in frames.items()),
+        sheet_version(df_memo),
+    )
+    return _build_search_index(divisions, frames, df_memo, version)
+
+
+def snippet(doc, query):
+    """일치 위치 주변 미리보기 (원문 기준, 없으면 앞부분)"""
+    text = doc.text.replace("\n", " ")
+    pos = text.lower().find(query.strip().lower())
+    if pos < 0:
+        return text[:SNIPPET_WIDTH * 2] + ("…" if len(text) > SNIPPET_WIDTH * 2 else "")
+    start = max(pos - SNIPPET_WIDTH, 0)
+    end = pos + len(query) + SNIPPET_WIDTH
+    return ("…" if start else "") + text[start:end] + ("…" if end < len(text) else "")
+
+
+def _result_label(conf, doc):
+    if doc.kind == "KPI":
+        return f"[{doc.year}] {conf['name']} · {doc.uid} {doc.title}"
+    if doc.kind == "정성":
+        return f"[{doc.year}.{doc.month}월] {conf['name']} · {doc.uid} {doc.title}"
+    return f"[{doc.year}.{doc.month}월 메모] {conf['name']} · {doc.title}"
+
+
+# 검색창은 프래그먼트: 입력 시 페이지 전체가 아닌 검색 영역만 재실행
+@timed_fragment("검색")
+def render_search_box(index):
+    """index = build_search_index(). 입력할 때마다(프래그먼트 재실행) 색인을 다시 찾거나 시트를 읽지 않음"""
+    query = st.text_input("KPI·메모 검색", placeholder="추진 목표, UID, 정성 목표/실적, 메모 내용", key="kpi_search")
+    if not query.strip():
+        return
+
+    started = time.perf_counter()
+    results = index.search(query, division_filter=can_view_division)  # 권한 없는 본부 결과 제외
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    st.caption(f"{len(results)}건{' 이상' if len(results) == MAX_RESULTS else ''} · {elapsed_ms:.1f} ms")
+
+    divisions = load_divisions()
+    for i, doc in enumerate(results):
+        conf = divisions[doc.division]
+        page = conf.get("page")
+        label = _result_label(conf, doc)
+        if not page:
+            st.markdown(f"- {label}")
+        elif st.button(label, key=f"search_hit_{i}"):
+            # 본부 페이지에서 ?kpi=UID 로 해당 KPI만 표시
+            if doc.uid:
+                st.session_state["focus_kpi"] = doc.uid
+            st.switch_page(page)
+        if doc.kind != "KPI" and doc.text:
+            st.caption(snippet(doc, query))
@@ -0,0 +1,237 @@
+# metrics.py
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import streamlit as st
+
+from helpers import replace_atomically
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 히스토그램 구간 (페이지 실행·외부 요청)
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTES_BUCKETS = (16_384, 65_536, 131_072, 262_144, 524_288, 1_048_576, 4_194_304)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name, self.help, self.label_names = name, help_text, tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            lines += [f"{self.name}{_labels(self.label_names, k)} {v}" for k, v in sorted(self._values.items())]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names=(), buckets=SECONDS_BUCKETS):
+        self.name, self.help, self.label_names = name, help_text, tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._values = {}  # 라벨 → [구간별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            counts = self._values.setdefault(label_values, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, counts in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, key, [('le', bound)])} {count}")
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, [('le', '+Inf')])} {counts[-1]}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {counts[-2]}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, key)} {counts[-1]}")
+        return lines
+
+
+class Gauge:
+    """수집 시점에 함수로 값을 읽는 게이지. read() 가 None 이면 생략, NaN 이면 "알 수 없음" 으로 내보냄"""
+
+    def __init__(self, name, help_text, read):
+        self.name, self.help, self._read = name, help_text, read
+
+    def render(self):
+        value = self._read()
+        if value is None:
+            return []
+        value = "NaN" if value != value else value  # Prometheus 표기
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {value}"]
+
+
+_session_gauge_warned = threading.Event()
+
+
+def _warn_session_gauge(reason, exc_info=False):
+    if not _session_gauge_warned.is_set():
+        _session_gauge_warned.set()
+        logger.warning("접속 세션 수를 읽을 수 없음 (%s): ssp_active_sessions = NaN", reason, exc_info=exc_info)
+
+
+def _active_sessions():
+    # 공개 API 가 없어 비공개 Runtime._session_mgr 사용 (streamlit 1.37 ~ 1.66 에서 확인).
+    # 업그레이드로 바뀌면 앱은 그대로 두고 NaN(알 수 없음) + 경고 로그 1회
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():  # 런타임 밖(테스트 등)
+        return None
+    session_mgr = getattr(Runtime.instance(), "_session_mgr", None)
+    if not hasattr(session_mgr, "num_active_sessions"):
+        _warn_session_gauge("streamlit 내부 구조 변경: Runtime._session_mgr.num_active_sessions 없음")
+        return float("nan")
+    try:
+        return session_mgr.num_active_sessions()
+    except Exception:
+        _warn_session_gauge("num_active_sessions() 실패", exc_info=True)
+        return float("nan")
+
+
+class MetricsRegistry:
+    """프로세스 전역 지표 (모든 세션 공유). render() = Prometheus 텍스트 형식"""
+
+    def __init__(self):
+        self.loader_calls = Counter("ssp_loader_calls_total", "캐시 로더 호출 수 (적중 포함)", ["loader"])
+        self.loader_misses = Counter("ssp_loader_misses_total", "캐시 로더 미스(실제 계산) 수", ["loader"])
+        self.fetch_seconds = Histogram("ssp_fetch_seconds", "외부 HTTP 요청 소요 시간", ["target", "outcome"])
+        self.rerun_seconds = Histogram("ssp_rerun_seconds", "페이지/프래그먼트 실행 시간", ["scope"])
+        self.payload_bytes = Histogram("ssp_page_payload_bytes", "페이지 실행 1회 전송량", ["page"], BYTES_BUCKETS)
+        self.active_sessions = Gauge("ssp_active_sessions", "현재 연결된 세션 수", _active_sessions)
+        self._metrics = [
+            self.loader_calls, self.loader_misses, self.fetch_seconds,
+            self.rerun_seconds, self.payload_bytes, self.active_sessions,
+        ]
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+@st.cache_resource
+def metrics():
+    return MetricsRegistry()
+
+
+# =========================
+# 계측 도우미
+# =========================
+def count_loader(name):
+    """st.cache_* 함수 바깥에 씌워 호출 수 집계. 함수 본문에서 record_loader_miss 로 미스 집계 → 적중률"""
+    def decorator(cached_func):
+        @functools.wraps(cached_func)
+        def wrapper(*args, **kwargs):
+            metrics().loader_calls.inc(name)
+            return cached_func(*args, **kwargs)
+        wrapper.clear = cached_func.clear
+        return wrapper
+    return decorator
+
+
+def record_loader_miss(name):
+    metrics().loader_misses.inc(name)
+
+
+@contextmanager
+def timed_fetch(target):
+    """외부 요청 1건 소요 시간. 예외가 나면 outcome="error" 로 기록 후 그대로 전파"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        metrics().fetch_seconds.observe(time.perf_counter() - started, target, outcome)
+
+
+# =========================
+# 내보내기: secrets [metrics] port = 9464 (HTTP /metrics) / file = "경로" (interval_s 마다 기록)
+# =========================
+class MetricsExporter:
+    def __init__(self, registry, port=None, host="127.0.0.1", file=None, interval_s=15):
+        self.registry = registry
+        self.server = None
+        if port:
+            self.server = ThreadingHTTPServer((host, int(port)), self._handler())
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+            logger.info("지표 내보내기: http://%s:%s/metrics", host, port)
+        if file:
+            threading.Thread(target=self._write_loop, args=(file, interval_s), name="metrics-file", daemon=True).start()
+            logger.info("지표 내보내기: %s (%s초마다)", file, interval_s)
+
+    def _handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def _write_loop(self, path, interval_s):
+        while True:
+            try:
+                text = self.registry.render()
+                replace_atomically(path, lambda tmp: Path(tmp).write_text(text, encoding="utf-8"))  # 수집기가 쓰다 만 파일을 읽지 않도록
+            except OSError:
+                logger.exception("지표 파일 기록 실패: %s", path)
+            time.sleep(interval_s)
+
+
+@st.cache_resource
+def start_metrics_exporter():
+    """secrets [metrics] 가 있으면 프로세스당 1회 내보내기 시작. 페이지마다 호출해도 됨"""
+    conf = st.secrets.get("metrics", {})
+    if not conf.get("port") and not conf.get("file"):
+        return None
+    try:
+        return MetricsExporter(
+            metrics(), port=conf.get("port"), host=conf.get("host", "127.0.0.1"),
+            file=conf.get("file"), interval_s=conf.get("interval_s", 15),
+        )
+    except OSError:
+        # 포트 사용 중 등: 앱은 계속 동작
+        logger.exception("지표 내보내기 시작 실패")
+        return None
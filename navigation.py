@@ -0,0 +1,21 @@
+# navigation.py
+import streamlit as st
+
+from auth import access_policy, visible_divisions
+
+HOME_PAGE = "홈.py"
+SUMMARY_PAGE = "pages/0_0.전사요약.py"
+
+
+def render_nav(divisions):
+    """사이드바 페이지 메뉴: 권한 있는 본부 페이지만 (기본 메뉴는 .streamlit/config.toml 에서 숨김).
+    divisions = load_divisions(). 로그인 확인 뒤에 호출"""
+    with st.sidebar:
+        st.page_link(HOME_PAGE, label="홈", icon="🏠")
+        st.page_link(SUMMARY_PAGE, label="전사 요약", icon="📊")
+        for conf in visible_divisions(divisions).values():
+            if conf.get("page"):
+                st.page_link(conf["page"], label=conf["name"])
+        st.divider()
+    if access_policy().degraded:
+        st.warning("⚠️ 본부 권한 시트를 불러오지 못해 일부 본부 화면이 보이지 않을 수 있습니다. 잠시 후 다시 시도해 주세요.")
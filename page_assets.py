@@ -0,0 +1,113 @@
+# page_assets.py
+import re
+
+import streamlit as st
+
+# 정량 KPI 표 (Styler.to_html) 공통 스타일
+KPI_TABLE_CSS = """
+<style>
+table {
+    width: 100%;
+    border-collapse: collapse;
+    font-family: 'Noto Sans KR', sans-serif;
+    font-size: 13px;
+    line-height: 1.2;  /* 행 높이 줄임 */
+}
+th, td {
+    padding: 3px 6px;  /* 세로 여백 줄임 */
+    text-align: right;
+    border: 1px solid #ddd;
+    vertical-align: middle;
+    word-break: keep-all;
+    white-space: pre-wrap;
+}
+thead {
+    background-color: #f2f2f2;
+    font-weight: bold;
+}
+.row_heading { display: none !important; }
+.blank { display: none !important; }
+</style>
+"""
+
+# 정성 KPI 전용 CSS (수직 레이아웃: 월 = 행)
+TEXTUAL_CSS = """
+<style>
+table.textual-v {
+    border-collapse: collapse;
+    font-family: 'Noto Sans KR', sans-serif;
+    font-size: 13px;
+    line-height: 1.4;
+    width: auto;
+    max-width: 100%;
+}
+table.textual-v thead {
+    background-color: #f2f2f2;
+    font-weight: bold;
+}
+table.textual-v th,
+table.textual-v td {
+    padding: 6px 10px;
+    text-align: left;
+    border: 1px solid #ddd;
+    vertical-align: top;
+    white-space: pre-wrap;
+    word-break: break-word;
+}
+table.textual-v .month-col {
+    width: 52px;
+    min-width: 52px;
+    text-align: center;
+}
+table.textual-v .content-col {
+    min-width: 120px;
+}
+</style>
+"""
+
+# 본부 페이지 공통 푸터 스타일
+FOOTER_CSS = """
+<style>
+.footer {
+    bottom: 0;
+    left: 0;
+    right: 0;
+    padding: 8px;
+    text-align: center;
+    font-size: 13px;
+    color: #666666;
+    z-index: 100;
+}
+</style>
+"""
+
+FOOTER_HTML = """
+<div class="footer">
+  ⓒ 2025 SeAH Special Steel Corp. All rights reserved.
+</div>
+"""
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_STYLE_TAG = re.compile(r"</?style[^>]*>", re.I)
+_SPACE = re.compile(r"\s+")
+_PUNCT_SPACE = re.compile(r"\s*([{};,])\s*")
+
+
+def minify_css(css):
+    """<style> 태그/주석/불필요한 공백 제거"""
+    css = _STYLE_TAG.sub("", _COMMENT.sub("", css))
+    return _PUNCT_SPACE.sub(r"\1", _SPACE.sub(" ", css)).strip()
+
+
+def inject_css(*stylesheets):
+    """페이지 스타일시트를 중복 제거 후 <style> 하나로 한 번만 주입.
+
+    표/카드마다 CSS를 앞에 붙이지 말고, 화면 구성 시작 시 페이지당 1회 호출한다.
+    """
+    blocks = []
+    for css in stylesheets:
+        css = minify_css(css)
+        if css and css not in blocks:
+            blocks.append(css)
+    if blocks:
+        st.markdown(f"<style>{''.join(blocks)}</style>", unsafe_allow_html=True)
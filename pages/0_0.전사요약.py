@@ -0,0 +1,3 @@
+from summary_page import render_summary_page
+
+render_summary_page()
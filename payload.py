@@ -0,0 +1,143 @@
+# payload.py
+import logging
+import threading
+import time
+from collections import defaultdict
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from metrics import metrics
+from rerun_metrics import record_rerun
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_KB = 512
+
+_unsupported_warned = threading.Event()
+
+
+class PageRun:
+    """페이지 실행 1회 동안 브라우저로 보낸 메시지 크기 (요소 유형별)"""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.duration = None
+        self.by_type = defaultdict(lambda: [0, 0])  # 유형 → [개수, 바이트]
+
+    def record(self, kind, size):
+        counts = self.by_type[kind]
+        counts[0] += 1
+        counts[1] += size
+
+    @property
+    def total_bytes(self):
+        return sum(size for _, size in self.by_type.values())
+
+    @property
+    def element_count(self):
+        return sum(count for count, _ in self.by_type.values())
+
+
+class PayloadStats:
+    """페이지별 누적 전송량 (프로세스 전역, 모든 세션 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages = {}
+
+    def add(self, run):
+        with self._lock:
+            page = self._pages.setdefault(run.page, {
+                "runs": 0, "total": 0, "max": 0, "last": 0, "by_type": defaultdict(int),
+            })
+            page["runs"] += 1
+            page["total"] += run.total_bytes
+            page["max"] = max(page["max"], run.total_bytes)
+            page["last"] = run.total_bytes
+            for kind, (_, size) in run.by_type.items():
+                page["by_type"][kind] += size
+
+    def snapshot(self):
+        with self._lock:
+            return {name: {**page, "by_type": dict(page["by_type"])} for name, page in self._pages.items()}
+
+
+@st.cache_resource
+def payload_stats():
+    return PayloadStats()
+
+
+def payload_budget(page):
+    """페이지 전송량 예산(바이트). secrets [payload] budget_kb / [payload.pages] 페이지명 = KB"""
+    conf = st.secrets.get("payload", {})
+    budget_kb = conf.get("pages", {}).get(page, conf.get("budget_kb", DEFAULT_BUDGET_KB))
+    return int(budget_kb * 1024)
+
+
+def _element_kind(msg):
+    msg_type = msg.WhichOneof("type")
+    if msg_type != "delta":
+        return msg_type or "other"
+    delta_type = msg.delta.WhichOneof("type")
+    if delta_type != "new_element":
+        return delta_type
+    element = msg.delta.new_element
+    kind = element.WhichOneof("type")
+    # Styler.to_html() 표는 st.markdown으로 나가므로 일반 마크다운과 구분
+    if kind == "markdown" and '<table id="T_' in element.markdown.body:
+        return "markdown:styler"
+    return kind
+
+
+def start_payload_meter(page):
+    """이번 실행에서 전송되는 모든 메시지의 직렬화 크기 기록 시작.
+    공개 API 가 없어 비공개 ScriptRunContext._enqueue 를 감쌈 (streamlit 1.37 ~ 1.66 에서 확인).
+    업그레이드로 없어지면 기록 없이 진행 (페이지는 그대로) + 경고 로그 1회"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    if not callable(getattr(ctx, "_enqueue", None)):
+        if not _unsupported_warned.is_set():
+            _unsupported_warned.set()
+            logger.warning("전송량 기록 불가 (streamlit 내부 구조 변경: ScriptRunContext._enqueue 없음)")
+        return None
+
+    run = PageRun(page)
+    # st.stop()/st.rerun() 으로 finish 없이 끝난 이전 실행의 래퍼는 벗기고 그 기록은 버림
+    enqueue = getattr(ctx._enqueue, "__wrapped__", ctx._enqueue)
+
+    def metered_enqueue(msg):
+        run.record(_element_kind(msg), msg.ByteSize())
+        enqueue(msg)
+
+    metered_enqueue.__wrapped__ = enqueue
+    ctx._enqueue = metered_enqueue
+    st.session_state["_payload_run"] = run
+    return run
+
+
+def finish_payload_meter():
+    """기록 종료 → 페이지별 집계·재실행 시간에 반영하고 예산 초과 시 경고 로그"""
+    run = st.session_state.pop("_payload_run", None)
+    if run is None:
+        return None
+
+    ctx = get_script_run_ctx()
+    if ctx is not None and hasattr(getattr(ctx, "_enqueue", None), "__wrapped__"):
+        ctx._enqueue = ctx._enqueue.__wrapped__
+
+    run.duration = time.perf_counter() - run.started
+    record_rerun(f"page:{run.page}", run.duration)
+    payload_stats().add(run)
+    metrics().payload_bytes.observe(run.total_bytes, run.page)
+    st.session_state["_payload_last"] = run
+
+    budget = payload_budget(run.page)
+    if run.total_bytes > budget:
+        logger.warning(
+            "페이지 전송량 예산 초과: %s %s bytes (예산 %s bytes, 요소 %s개)",
+            run.page, f"{run.total_bytes:,}", f"{budget:,}", run.element_count,
+        )
+    return run
@@ -0,0 +1,111 @@
+# raw_material.py
+import hashlib
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests as py_requests
+import streamlit as st
+
+from helpers import replace_atomically, with_script_ctx
+from metrics import timed_fetch
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ["기간", "철광석(달러_톤)", "철스크랩(달러_톤)"]
+PER_PAGE = 1000
+FETCH_WORKERS = 4
+REQUEST_TIMEOUT_S = 10
+RETRY_AFTER_S = 300   # API 실패 후 이 시간 동안은 요청하지 않고 저장본 사용
+
+
+class RawMaterialUnavailable(Exception):
+    pass
+
+
+def store_path(url, service_key):
+    # 원자재 가격 시계열 저장본 (재시작 후에도 증분 요청의 기준). 주소·키별로 따로 (벤치마크·대체 서버와 섞이지 않게)
+    name = hashlib.sha1(f"{url}|{service_key}".encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"ssp_raw_material_{name}.csv")
+
+
+def read_store(path):
+    try:
+        return pd.read_csv(path, dtype={"기간": str})
+    except (OSError, ValueError):
+        return None
+
+
+def _write_store(path, df):
+    try:
+        replace_atomically(path, lambda tmp: df.to_csv(tmp, index=False))
+    except OSError:
+        logger.warning("원자재 가격 저장 실패: %s", path)
+
+
+@st.cache_resource
+def _last_failure():
+    return {"at": 0.0}, threading.Lock()
+
+
+def _get_page(url, service_key, page, since):
+    params = {"page": page, "perPage": PER_PAGE, "serviceKey": service_key}
+    if since:
+        # odcloud 조건 검색: 저장된 마지막 기간부터 (마지막 달 수정분도 다시 받음)
+        params["cond[기간::GTE]"] = since
+    with timed_fetch("odcloud"):
+        response = py_requests.get(url, params=params, timeout=REQUEST_TIMEOUT_S)
+        response.raise_for_status()
+    return response.json()
+
+
+def _fetch_since(url, service_key, since):
+    """since 이후 전체 (1쪽에서 건수 확인 → 나머지 쪽은 동시 요청)"""
+    first = _get_page(url, service_key, 1, since)
+    rows = list(first["data"])
+    count = first.get("matchCount", first.get("totalCount", len(rows)))
+    pages = math.ceil(count / PER_PAGE)
+    if pages > 1:
+        @with_script_ctx
+        def get(page):
+            return _get_page(url, service_key, page, since)["data"]
+
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, pages - 1)) as pool:
+            for data in pool.map(get, range(2, pages + 1)):
+                rows += data
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def refresh_series(url, service_key):
+    """저장본 + 새 기간만 요청해 합친 시계열. 실패하면 RawMaterialUnavailable (최근 실패 직후엔 요청 없이)"""
+    path = store_path(url, service_key)
+    stored = read_store(path)
+    failure, lock = _last_failure()
+    if time.time() - failure["at"] < RETRY_AFTER_S:
+        raise RawMaterialUnavailable("최근 요청 실패, 재시도 대기 중")
+
+    since = stored["기간"].max() if stored is not None and not stored.empty else None
+    try:
+        try:
+            new = _fetch_since(url, service_key, since)
+        except (py_requests.RequestException, ValueError, KeyError) as e:
+            if since is None:
+                raise
+            # 데이터셋이 조건 검색을 지원하지 않는 경우 등: 조건 없이 전체를 다시 받음
+            logger.warning("원자재 가격 조건 요청 실패, 전체 요청으로 대체: %s", e)
+            new = _fetch_since(url, service_key, None)
+    except (py_requests.RequestException, ValueError, KeyError) as e:
+        with lock:
+            failure["at"] = time.time()
+        raise RawMaterialUnavailable(str(e)) from e
+
+    df = pd.concat([stored, new], ignore_index=True) if stored is not None else new
+    # 같은 기간은 새로 받은 값 우선 (조건 검색이 무시돼 전체가 와도 기간 기준으로 합침)
+    df = df.drop_duplicates("기간", keep="last").sort_values("기간", ignore_index=True)
+    _write_store(path, df)
+    return df
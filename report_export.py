@@ -0,0 +1,284 @@
+# report_export.py
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from division_page import memo_mask, numeric_table
+from kpi_data import MONTHS
+from rerun_metrics import timed_fragment
+
+EXPORT_WORKERS = 2   # 보고서 생성 전용 스레드 (사용자 세션과 분리)
+KEEP_VERSIONS = 4    # 데이터 버전별 완성 파일 보관 개수
+POLL_INTERVAL_S = 2  # 생성 중일 때 완료 확인 주기
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# 달성 색상: 목표 이상 / 위험 기준 이상 / 미달
+GOOD_FILL = PatternFill("solid", fgColor="D5F5E3")
+WARN_FILL = PatternFill("solid", fgColor="FCF3CF")
+BAD_FILL = PatternFill("solid", fgColor="FADBD8")
+HEADER_FILL = PatternFill("solid", fgColor="D6EAF8")
+BOLD = Font(bold=True)
+TITLE_FONT = Font(bold=True, size=14)
+WRAP = Alignment(wrap_text=True, vertical="top")
+
+_SHEET_NAME_INVALID = re.compile(r"[\[\]:*?/\\]")
+_jobs_lock = threading.Lock()
+
+
+@st.cache_resource
+def _export_pool():
+    return ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="excel-export")
+
+
+@st.cache_resource
+def _export_jobs():
+    # 데이터 버전 → Future(bytes). 모든 세션 공유, 오래된 버전부터 삭제
+    return {}
+
+
+def data_version(loaded, memos, year, month):
+    """보고서에 들어가는 데이터의 지문. 시트 캐시가 갱신돼 값이 바뀌면 달라짐"""
+    h = hashlib.sha1(f"{year}-{month}".encode())
+    for key, data in loaded.items():
+        h.update(key.encode())
+        if isinstance(data, Exception):
+            h.update(repr(data).encode())
+            continue
+        cube = data["cube"]
+        h.update(repr(cube.index.tolist()).encode())
+        h.update(cube.to_numpy(dtype=float).tobytes())
+        h.update(repr([(k["uid"], k["name"], k["unit"], k["yearly_goal_text"]) for k in data["numeric"]]).encode())
+        h.update(repr([(k["uid"], k["name"], k["targets"], k["results"]) for k in data["textual"]]).encode())
+    h.update(repr(memos.to_numpy().tolist()).encode())
+    return h.hexdigest()
+
+
+def _sheet_name(name, used):
+    base = _SHEET_NAME_INVALID.sub("", name)[:31]
+    title, n = base, 2
+    while title in used:
+        suffix = f"({n})"
+        title, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(title)
+    return title
+
+
+def _cell_value(val):
+    if val is None or val is pd.NA or (isinstance(val, float) and pd.isna(val)):
+        return None
+    return val.item() if hasattr(val, "item") else val
+
+
+def _text_cell(val):
+    # 시트에 "\\n" 문자 그대로 입력된 줄바꿈도 셀 안 줄바꿈으로
+    val = _cell_value(val)
+    return None if val is None else str(val).replace("\\r\\n", "\n").replace("\\n", "\n")
+
+
+def _achievement_fill(target, result, lower_is_better, at_risk_ratio):
+    if target is None or result is None or not target:
+        return None
+    if lower_is_better:
+        ratio = target / result if result else float("inf")
+    else:
+        ratio = result / target
+    if ratio >= 1:
+        return GOOD_FILL
+    return WARN_FILL if ratio >= at_risk_ratio else BAD_FILL
+
+
+def _write_row(ws, row, values, font=None, fill=None):
+    for col, val in enumerate(values, start=1):
+        cell = ws.cell(row=row, column=col, value=_cell_value(val))
+        if font:
+            cell.font = font
+        if fill:
+            cell.fill = fill
+    return row + 1
+
+
+def _reported_months(cube, uid):
+    """실적이 입력된 월 (큐브에서 NaN 이 아닌 월). 미보고 월은 표에서 0 이라 값만으로는 구분 불가"""
+    if uid not in cube.index:
+        return set()
+    results = cube["실적"].loc[uid]
+    return {int(m) for m in results.index[results.notna()]}
+
+
+def _write_numeric_kpi(ws, row, number, kpi, table, month_labels, lower_is_better, at_risk_ratio, reported):
+    ws.cell(row=row, column=1, value=f"{number}. {kpi['name']}").font = BOLD
+    ws.cell(row=row + 1, column=1, value=f"[연간목표 : {kpi['yearly_goal_text']}]  [단위: {_cell_value(kpi['unit']) or ''}]")
+    row += 2
+
+    table = table.rename(columns=month_labels or {})
+    row = _write_row(ws, row, table.columns, BOLD, HEADER_FILL)
+    first = row
+    for values in table.itertuples(index=False):
+        row = _write_row(ws, row, values)
+        for col in range(2, len(table.columns) + 1):
+            ws.cell(row=row - 1, column=col).number_format = "#,##0"
+
+    # 표 행 순서: 목표(k행) → 실적(k행) → 목표比(k행). 열: 구분, 1~12월, (누적)
+    # 실적 미보고 월은 색칠하지 않고, 누적은 마지막 보고 월까지의 목표 누계와 비교
+    k = len(table) // 3
+    ytd_months = [m for m in MONTHS if reported and m <= max(reported)]
+    for i in range(k):
+        target_row, result_row, diff_row = first + i, first + k + i, first + 2 * k + i
+        for col in range(2, len(table.columns) + 1):
+            result_cell = ws.cell(row=result_row, column=col)
+            if col - 1 in MONTHS:
+                target = ws.cell(row=target_row, column=col).value if col - 1 in reported else None
+            else:
+                target = sum(ws.cell(row=target_row, column=m + 1).value or 0 for m in ytd_months) if ytd_months else None
+            fill = _achievement_fill(target, result_cell.value, lower_is_better, at_risk_ratio)
+            if fill:
+                result_cell.fill = fill
+            diff_cell = ws.cell(row=diff_row, column=col)
+            if isinstance(diff_cell.value, (int, float)) and diff_cell.value:
+                diff_cell.font = Font(color="0000FF" if diff_cell.value > 0 else "FF0000")
+    return row + 1
+
+
+def _write_textual_kpi(ws, row, number, kpi):
+    ws.cell(row=row, column=1, value=f"{number}. {kpi['name']}").font = BOLD
+    row = _write_row(ws, row + 1, ["월", "목표", "실적"], BOLD, HEADER_FILL)
+    for m, target, result in zip(MONTHS, kpi["targets"], kpi["results"]):
+        if _cell_value(target) is None and _cell_value(result) is None:
+            continue
+        row = _write_row(ws, row, [f"{m}월", _text_cell(target), _text_cell(result)])
+        ws.cell(row=row - 1, column=2).alignment = WRAP
+        ws.cell(row=row - 1, column=3).alignment = WRAP
+    return row + 1
+
+
+def _write_memos(ws, row, memos):
+    ws.cell(row=row, column=1, value="📝 메모").font = BOLD
+    row = _write_row(ws, row + 1, ["월", "입력자", "메모"], BOLD, HEADER_FILL)
+    if memos.empty:
+        return _write_row(ws, row, ["-", "", "메모 없음"])
+    for _, memo in memos.sort_values("월").iterrows():
+        row = _write_row(ws, row, [f"{int(memo['월'])}월", memo.get("입력자"), _text_cell(memo.get("메모"))])
+        ws.cell(row=row - 1, column=3).alignment = WRAP
+    return row
+
+
+def _write_division_sheet(ws, conf, data, memos, year, at_risk_ratio):
+    ws.cell(row=1, column=1, value=f"{year}년 {conf['name']} 주요 추진 목표").font = TITLE_FONT
+    row, number = 3, 1
+    for kpi in data["numeric"]:
+        # 표는 본부 페이지와 같은 함수로 여기(보고서 작업 스레드)에서 생성. load_division 은 데이터만
+        table = numeric_table(data["cube"], kpi["uid"], conf["stacked_groups"].get(kpi["uid"]), conf["show_cumulative"])
+        row = _write_numeric_kpi(
+            ws, row, number, kpi, table, conf["month_labels"].get(kpi["uid"]),
+            kpi["uid"] in conf["lower_is_better"], at_risk_ratio, _reported_months(data["cube"], kpi["uid"]),
+        )
+        number += 1
+    for kpi in data["textual"]:
+        row = _write_textual_kpi(ws, row, number, kpi)
+        number += 1
+    _write_memos(ws, row, memos)
+
+    ws.column_dimensions["A"].width = 14
+    for col in range(2, len(MONTHS) + 3):
+        ws.column_dimensions[get_column_letter(col)].width = 11
+    # 정성 KPI 목표/실적, 메모 열은 넓게
+    ws.column_dimensions["B"].width = 40
+    ws.column_dimensions["C"].width = 60
+
+
+def _write_summary_sheet(ws, summary, year, month, at_risk_ratio):
+    ws.cell(row=1, column=1, value=f"{year}년 전사 KPI 달성 현황 ({month}월 누계 기준)").font = TITLE_FONT
+    columns = ["본부", "KPI", "단위", "목표", "실적", "차이", "달성률"]
+    row = _write_row(ws, 3, columns, BOLD, HEADER_FILL)
+    for _, r in summary.iterrows():
+        _write_row(ws, row, [r[c] for c in columns])
+        rate = r["달성률"]
+        cell = ws.cell(row=row, column=len(columns))
+        cell.number_format = "0%"
+        if not pd.isna(rate):
+            cell.fill = GOOD_FILL if rate >= 1 else WARN_FILL if rate >= at_risk_ratio else BAD_FILL
+        for col in (4, 5, 6):
+            ws.cell(row=row, column=col).number_format = "#,##0"
+        row += 1
+    for col, width in zip("ABCDEFG", (18, 40, 8, 12, 12, 12, 10)):
+        ws.column_dimensions[col].width = width
+
+
+def build_workbook(divisions, loaded, summary, memos, year, month, at_risk_ratio):
+    """요약 시트 + 본부별 시트(정량 표·정성 표·메모, 달성 색상) → xlsx bytes. 워커 스레드에서 실행"""
+    wb = Workbook()
+    used = set()
+    ws = wb.active
+    ws.title = _sheet_name("전사 요약", used)
+    _write_summary_sheet(ws, summary, year, month, at_risk_ratio)
+
+    for key, conf in divisions.items():
+        ws = wb.create_sheet(_sheet_name(conf["name"], used))
+        data = loaded[key]
+        if isinstance(data, Exception):
+            ws.cell(row=1, column=1, value=f"{conf['name']} 데이터를 불러오지 못했습니다: {data}")
+            continue
+        division_memos = memos[memo_mask(memos, conf)]
+        _write_division_sheet(ws, conf, data, division_memos, year, at_risk_ratio)
+
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def submit_export(version, *args):
+    """버전별 보고서 작업 1개만 실행. 이미 있으면(진행 중/완료) 그대로 반환, 실패한 작업은 다시 실행"""
+    jobs = _export_jobs()
+    with _jobs_lock:
+        future = jobs.get(version)
+        if future is None or (future.done() and future.exception() is not None):
+            future = _export_pool().submit(build_workbook, *args)
+            jobs[version] = future
+            while len(jobs) > KEEP_VERSIONS:
+                jobs.pop(next(iter(jobs)))
+    return future
+
+
+# 생성 중에만 그려지는 프래그먼트: 주기적으로 이 영역만 재실행해 완료를 확인하고, 끝나면 페이지를 다시 그려 받기 버튼 표시.
+# 완료 후에는 그려지지 않으므로 주기 실행도 멈춤
+@timed_fragment("엑셀 내보내기 대기", run_every=POLL_INTERVAL_S)
+def _wait_for_export(version):
+    future = _export_jobs().get(version)
+    if future is None or future.done():
+        st.rerun()
+    st.info("보고서를 만드는 중입니다. 완료되면 받기 버튼이 나타납니다. 다른 화면을 계속 보셔도 됩니다.")
+
+
+# 내보내기 영역은 프래그먼트: 생성 요청 시 페이지 전체가 아닌 이 영역만 재실행
+@timed_fragment("엑셀 내보내기")
+def render_export(divisions, loaded, summary, memos, year, month, at_risk_ratio):
+    version = data_version(loaded, memos, year, month)
+    future = _export_jobs().get(version)
+
+    if future is None or (future.done() and future.exception() is not None):
+        if future is not None:
+            st.error(f"보고서 생성 실패: {future.exception()}")
+        if st.button("📥 전 본부 Excel 보고서 만들기", key="export_start"):
+            future = submit_export(version, divisions, loaded, summary, memos, year, month, at_risk_ratio)
+        else:
+            return
+
+    if not future.done():
+        _wait_for_export(version)
+        return
+
+    st.download_button(
+        "📥 전 본부 Excel 보고서 받기",
+        data=future.result(),
+        file_name=f"{year}년_{month}월_본부별_주요추진목표.xlsx",
+        mime=XLSX_MIME,
+        key="export_download",
+    )
@@ -0,0 +1,98 @@
+# rerun_metrics.py
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from metrics import metrics
+
+HISTORY_SIZE = 30
+STAGE_BUFFER_SIZE = 500  # 단계별 시간 기록 링 버퍼 (세션별)
+
+_stage_depth = threading.local()
+
+
+def record_rerun(scope, seconds, closes_run=True):
+    """재실행 1회의 범위(페이지/프래그먼트)와 소요 시간을 세션 이력에 추가"""
+    history = st.session_state.setdefault("_rerun_history", deque(maxlen=HISTORY_SIZE))
+    history.append((scope, seconds))
+    metrics().rerun_seconds.observe(seconds, scope)
+
+    # 단계 기록 중이면 이번 실행을 닫는 표시(깊이 0) 추가 후 실행 번호 증가
+    stages = st.session_state.get("_stage_buffer")
+    if stages is not None and closes_run:
+        run_no = st.session_state.get("_stage_run", 0)
+        stages.append((run_no, scope, 0, time.perf_counter() - seconds, seconds))
+        st.session_state["_stage_run"] = run_no + 1
+
+
+def rerun_history():
+    return list(st.session_state.get("_rerun_history", []))
+
+
+@contextmanager
+def timed_rerun(scope, closes_run=True):
+    """closes_run=False: 페이지 실행 안에서 함께 실행된 부분. 이력에는 남기되 단계 기록에서는 한 단계로"""
+    started = time.perf_counter()
+    try:
+        if closes_run:
+            yield
+        else:
+            with timed_stage(scope):
+                yield
+    finally:
+        record_rerun(scope, time.perf_counter() - started, closes_run)
+
+
+def timed_fragment(scope, run_every=None):
+    """st.fragment로 감싸 독립 재실행되게 하고, 실행마다 소요 시간을 기록.
+
+    프래그먼트 안의 위젯을 조작하면 페이지 전체가 아니라 이 함수만 다시 실행된다.
+    run_every(초)를 주면 그려져 있는 동안 그 주기로도 재실행된다.
+    """
+    def decorator(func):
+        @st.fragment(run_every=run_every)
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # 프래그먼트 단독 재실행일 때만 실행 1회. 페이지 전체 실행 중이면 그 실행의 한 단계
+            ctx = get_script_run_ctx()
+            standalone = bool(ctx and getattr(ctx, "fragment_ids_this_run", None))
+            with timed_rerun(f"fragment:{scope}", closes_run=standalone):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def set_stage_timing(enabled):
+    """단계별 시간 기록 켜기/끄기 (관리자 진단 패널). 끄면 버퍼도 비움"""
+    if enabled:
+        st.session_state.setdefault("_stage_buffer", deque(maxlen=STAGE_BUFFER_SIZE))
+    else:
+        st.session_state.pop("_stage_buffer", None)
+
+
+def stage_history():
+    """(실행 번호, 단계, 깊이, 시작 perf_counter, 초) 목록. 깊이 0 = 해당 실행 전체"""
+    return list(st.session_state.get("_stage_buffer", []))
+
+
+@contextmanager
+def timed_stage(name):
+    """페이지 실행 중 한 단계의 소요 시간 기록. 기록이 꺼져 있으면 세션 조회 1번만 하고 통과"""
+    stages = st.session_state.get("_stage_buffer")
+    if stages is None:
+        yield
+        return
+
+    depth = getattr(_stage_depth, "value", 0) + 1
+    _stage_depth.value = depth
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stage_depth.value = depth - 1
+        stages.append((st.session_state.get("_stage_run", 0), name, depth, started, time.perf_counter() - started))
@@ -0,0 +1,160 @@
+# summary_page.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from auth import require_login, visible_divisions
+from debug_panel import render_debug_panel
+from division_page import load_division, load_divisions, load_sheet
+from helpers import with_script_ctx
+from kpi_data import MONTHS, cumulative_achievement
+from kpi_search import build_search_index, render_search_box
+from metrics import start_metrics_exporter
+from navigation import render_nav
+from page_assets import FOOTER_CSS, FOOTER_HTML, inject_css
+from payload import finish_payload_meter, start_payload_meter
+from report_export import render_export
+from rerun_metrics import timed_stage
+
+AT_RISK_RATIO = 0.9  # 달성률이 이 미만이면 위험 KPI
+MAX_WORKERS = 8
+CARDS_PER_ROW = 5
+
+
+def load_all_divisions(divisions, year):
+    """전 본부 데이터를 동시에 준비. 본부 페이지와 같은 load_division 캐시를 사용.
+
+    반환: 본부 key → 준비된 데이터 또는 발생한 예외
+    """
+    if not divisions:
+        return {}
+    load = with_script_ctx(load_division)
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(divisions))) as pool:
+        futures = {key: pool.submit(load, conf, year) for key, conf in divisions.items()}
+
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            results[key] = e
+    return results
+
+
+def summarize_division(conf, data, month):
+    """본부 1개의 정량 KPI별 기준월 달성 현황"""
+    numeric = data["numeric"]
+    if not numeric:
+        return pd.DataFrame(columns=["본부", "KPI", "단위", "목표", "실적", "차이", "달성률", "위험"])
+
+    uids = [kpi["uid"] for kpi in numeric]
+    # 누적 열을 숨기는 본부(재고 등 잔량형 지표)는 누계 대신 기준월 값으로 비교
+    snapshot_uids = [] if conf["show_cumulative"] else uids
+    df = cumulative_achievement(data["cube"], uids, month, snapshot_uids, conf["lower_is_better"])
+    df.insert(0, "본부", conf["name"])
+    df.insert(1, "KPI", [kpi["name"] for kpi in numeric])
+    df.insert(2, "단위", [kpi["unit"] for kpi in numeric])
+    df["위험"] = df["달성률"] < AT_RISK_RATIO
+    return df.reset_index(drop=True)
+
+
+def render_division_card(conf, df):
+    with st.container(border=True):
+        st.markdown(f"**{conf['name']}**")
+        at_risk = int(df["위험"].sum())
+        rate = df["달성률"].mean()
+        st.metric(
+            "평균 달성률",
+            "-" if pd.isna(rate) else f"{rate:.0%}",
+            f"위험 KPI {at_risk} / {len(df)}",
+            delta_color="inverse" if at_risk else "off",
+        )
+        st.page_link(conf["page"], label="상세 보기", icon="➡️")
+
+
+def render_summary_page():
+    """전사 요약: 전 본부 KPI 달성률 / 누계 차이 / 위험 KPI 수를 한 화면에"""
+    st.set_page_config(layout="wide", initial_sidebar_state="collapsed")
+    start_metrics_exporter()  # secrets [metrics] 설정 시 프로세스당 1회
+
+    require_login()  # 로그인 되어 있지 않으면 여기서 차단됨
+    render_nav(load_divisions())
+    start_payload_meter("전사 요약")  # 이번 실행의 전송량(요소별 직렬화 크기) 기록
+
+    this_year = datetime.today().year
+    current_month = datetime.today().month
+
+    st.markdown(f"### {this_year}년 전사 주요 추진 목표 요약")
+    inject_css(FOOTER_CSS)
+
+    # 전 본부·전 연도 KPI/메모 검색 (결과 클릭 시 해당 본부 페이지의 그 KPI로 이동).
+    # 색인은 시트를 불러오는 여기서 준비 (시트 내용이 바뀐 경우에만 다시 만듦), 검색 입력은 프래그먼트만 재실행
+    with timed_stage("search_index"):
+        search_index = build_search_index()
+    render_search_box(search_index)
+
+    month = st.select_slider(
+        "기준월 (1월~기준월 누계)",
+        options=MONTHS,
+        value=max(current_month - 1, 1),
+        format_func=lambda m: f"{m}월",
+    )
+
+    # 권한 있는 본부만 불러와 요약 (카드·표·Excel 모두)
+    divisions = {key: conf for key, conf in visible_divisions(load_divisions()).items() if conf.get("page")}
+    if not divisions:
+        st.info("볼 수 있는 본부가 없습니다. 본부 권한은 관리자에게 요청해 주세요.")
+        st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+        finish_payload_meter()
+        render_debug_panel()
+        return
+    with timed_stage("load_all_divisions"):
+        loaded = load_all_divisions(divisions, this_year)
+
+    summaries = []
+    for key, conf in divisions.items():
+        data = loaded[key]
+        if isinstance(data, Exception):
+            st.warning(f"{conf['name']} 데이터를 불러오지 못했습니다: {data}")
+            continue
+        with timed_stage(f"summarize {key}"):
+            summaries.append((conf, summarize_division(conf, data, month)))
+
+    # 본부별 카드 (나란히)
+    for i in range(0, len(summaries), CARDS_PER_ROW):
+        for col, (conf, df) in zip(st.columns(CARDS_PER_ROW), summaries[i:i + CARDS_PER_ROW]):
+            with col:
+                render_division_card(conf, df)
+
+    # 전 KPI 표 (달성률 낮은 순)
+    df_all = pd.concat([df for _, df in summaries if not df.empty], ignore_index=True) if summaries else pd.DataFrame()
+
+    # 월말 보고용 Excel (본부별 시트). 생성은 백그라운드 스레드, 데이터가 같으면 만든 파일 재사용
+    df_memo = load_sheet(st.secrets["google_sheets"]["memo_url"])
+    render_export(divisions, loaded, df_all, df_memo[df_memo["년도"] == this_year], this_year, month, AT_RISK_RATIO)
+
+    if df_all.empty:
+        st.info("표시할 정량 KPI가 없습니다.")
+    else:
+        st.markdown(f"#### KPI별 달성 현황 ({month}월 기준)")
+        st.caption(f"달성률 {AT_RISK_RATIO:.0%} 미만은 위험 KPI. 재고 등 잔량형 지표는 누계 대신 기준월 값으로 비교")
+        if st.toggle("위험 KPI만 보기", value=False):
+            df_all = df_all[df_all["위험"]]
+        df_all = df_all.sort_values("달성률", na_position="last")
+        df_all["달성률"] = df_all["달성률"] * 100
+        st.dataframe(df_all, hide_index=True, use_container_width=True, column_config={
+            "목표": st.column_config.NumberColumn(format="%.0f"),
+            "실적": st.column_config.NumberColumn(format="%.0f"),
+            "차이": st.column_config.NumberColumn(format="%.0f"),
+            "달성률": st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=150),
+            "위험": st.column_config.CheckboxColumn(),
+        })
+
+    # Footer 출력
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+
+    # 전송량 집계 (예산 초과 시 경고 로그) + 관리자 진단 패널
+    finish_payload_meter()
+    render_debug_panel()
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# 앱 모듈은 저장소 루트에 평면 배치 (streamlit run 기준)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
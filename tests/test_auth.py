@@ -0,0 +1,95 @@
+# tests/test_auth.py
+from auth import ALL_DIVISIONS, AccessPolicy, issue_session_token, verify_session_token
+
+KEY = "test-secret"
+USER = {"email": "a@seah.co.kr", "name": "가나다"}
+
+
+def _policy(**conf):
+    return AccessPolicy.from_config(conf)
+
+
+def test_allows_listed_email_and_domain():
+    policy = _policy(allowed_emails=[" A@Seah.co.kr "], allowed_domains=["@seah-cp.co.kr"])
+    assert policy.allows("a@seah.co.kr")
+    assert policy.allows("누구@SEAH-CP.co.kr")
+    assert not policy.allows("b@seah.co.kr")
+    assert not policy.allows("")
+
+
+def test_denied_overrides_domain_and_group():
+    policy = _policy(allowed_domains=["seah.co.kr"], denied_emails=["x@seah.co.kr"],
+                     groups={"기획팀": ["x@seah.co.kr"]})
+    assert policy.allows("y@seah.co.kr")
+    assert not policy.allows("x@seah.co.kr")
+
+
+def test_group_members_and_group_domains_allowed():
+    policy = _policy(groups={"기획팀": ["b@seah.co.kr", "@seah-cp.co.kr"]})
+    assert policy.allows("b@seah.co.kr")
+    assert policy.allows("c@seah-cp.co.kr")
+    assert not policy.allows("c@seah.co.kr")
+
+
+def test_division_mask_without_role_config_is_all():
+    policy = _policy(allowed_emails=["a@seah.co.kr"])
+    assert policy.division_mask("a@seah.co.kr") == ALL_DIVISIONS
+    assert policy.mask_allows(ALL_DIVISIONS, "설정에_없는_본부")
+
+
+def test_division_mask_from_roles_groups_and_rules():
+    policy = AccessPolicy.from_config(
+        {
+            "allowed_domains": ["seah.co.kr"],
+            "admin_emails": ["boss@seah.co.kr"],
+            "groups": {"기획팀": ["p@seah.co.kr"]},
+            "roles": {"임원": ["*"], "영업": ["sa", "gs"]},
+            "user_roles": {"s@seah.co.kr": ["영업"], "기획팀": ["임원"]},
+        },
+        division_rules=[("@seah.co.kr", ["rd"])],
+    )
+    sales = policy.division_mask("s@seah.co.kr")
+    assert policy.mask_allows(sales, "sa") and policy.mask_allows(sales, "gs")
+    assert policy.mask_allows(sales, "rd")  # @도메인 시트 규칙
+    assert not policy.mask_allows(sales, "at")
+    assert policy.division_mask("p@seah.co.kr") == ALL_DIVISIONS
+    assert policy.division_mask("boss@seah.co.kr") == ALL_DIVISIONS
+    other = policy.division_mask("z@seah.co.kr")
+    assert policy.mask_allows(other, "rd") and not policy.mask_allows(other, "sa")
+
+
+def test_permissions_url_defaults_to_no_divisions():
+    policy = _policy(allowed_emails=["a@seah.co.kr"], permissions_url="unused.csv")
+    assert policy.division_mask("a@seah.co.kr") == 0
+
+
+def test_version_changes_with_config():
+    assert _policy(allowed_emails=["a@seah.co.kr"]).version == _policy(allowed_emails=["A@seah.co.kr"]).version
+    assert _policy(allowed_emails=["a@seah.co.kr"]).version != _policy(allowed_emails=["b@seah.co.kr"]).version
+
+
+def test_session_token_round_trip():
+    token = issue_session_token(USER, "sid1", KEY, ttl_hours=1, now=1000)
+    payload, expired = verify_session_token(token, KEY, now=1001)
+    assert not expired
+    assert (payload["email"], payload["name"], payload["sid"]) == ("a@seah.co.kr", "가나다", "sid1")
+
+
+def test_session_token_expiry():
+    token = issue_session_token(USER, "sid1", KEY, ttl_hours=1, now=1000)
+    payload, expired = verify_session_token(token, KEY, now=1000 + 3600)
+    assert payload["sid"] == "sid1" and expired
+
+
+def test_session_token_rejects_tampering():
+    token = issue_session_token(USER, "sid1", KEY, now=1000)
+    body, _, signature = token.partition(".")
+    other = issue_session_token({"email": "evil@x.com"}, "sid1", KEY, now=1000).partition(".")[0]
+    assert verify_session_token(token, "other-key", now=1000) == (None, False)
+    assert verify_session_token(f"{other}.{signature}", KEY, now=1000) == (None, False)
+    assert verify_session_token(f"{body}.", KEY, now=1000) == (None, False)
+
+
+def test_session_token_rejects_malformed():
+    for token in (None, "", "no-dot", ".sig", "본문.서명", "a.éé"):
+        assert verify_session_token(token, KEY, now=1000) == (None, False)
@@ -0,0 +1,122 @@
+# tests/test_id_token.py
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+import id_token
+from id_token import IdTokenError, verify_id_token
+
+JWKS_URL = "https://keys.test/certs"
+AUDIENCE = "client-id"
+ISSUER = "https://accounts.google.com"
+
+
+class FakeResponse:
+    def __init__(self, body, cache_control="max-age=600"):
+        self._body = body
+        self.headers = {"Cache-Control": cache_control}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def jwks(monkeypatch, private_key):
+    """JWKS 응답 (kid = k1). calls = 조회 횟수"""
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True) | {"kid": "k1", "alg": "RS256", "use": "sig"}
+    state = {"body": {"keys": [jwk]}, "calls": 0}
+
+    def get(url, timeout):
+        assert url == JWKS_URL
+        state["calls"] += 1
+        return FakeResponse(state["body"])
+
+    id_token._jwks_memory.clear()
+    monkeypatch.setattr(id_token.py_requests, "get", get)
+    yield state
+    id_token._jwks_memory.clear()
+
+
+def _token(private_key, kid="k1", **overrides):
+    now = int(time.time())
+    claims = {"iss": ISSUER, "aud": AUDIENCE, "iat": now, "exp": now + 600, "email": "a@seah.co.kr", "email_verified": True}
+    claims.update(overrides)
+    claims = {k: v for k, v in claims.items() if v is not None}
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def _verify(token):
+    return verify_id_token(token, AUDIENCE, jwks_url=JWKS_URL)
+
+
+def test_valid_token(jwks, private_key):
+    assert _verify(_token(private_key))["email"] == "a@seah.co.kr"
+    assert _verify(_token(private_key, iss="accounts.google.com"))["email"] == "a@seah.co.kr"
+    assert jwks["calls"] == 1  # 두 번째는 메모리 캐시
+
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "other-client"},
+    {"iss": "https://evil.example"},
+    {"exp": int(time.time()) - 3600},
+    {"exp": None},
+    {"email": None},
+    {"email_verified": False},
+])
+def test_invalid_claims(jwks, private_key, overrides):
+    with pytest.raises(IdTokenError):
+        _verify(_token(private_key, **overrides))
+
+
+def test_wrong_signing_key(jwks):
+    other = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with pytest.raises(IdTokenError):
+        _verify(_token(other))
+
+
+def test_unknown_kid_refetches_once(jwks, private_key):
+    with pytest.raises(IdTokenError, match="알 수 없는 서명 키"):
+        _verify(_token(private_key, kid="k2"))
+    assert jwks["calls"] == 2  # 캐시 조회 + 키 교체 대비 강제 갱신
+
+
+@pytest.mark.parametrize("token", ["", "not-a-jwt", "a.b.c"])
+def test_malformed_token(jwks, token):
+    with pytest.raises(IdTokenError):
+        _verify(token)
+
+
+def test_token_without_kid(jwks, private_key):
+    token = jwt.encode({"email": "a@seah.co.kr"}, private_key, algorithm="RS256")
+    with pytest.raises(IdTokenError, match="kid"):
+        _verify(token)
+
+
+def test_hs256_token_rejected(jwks, private_key):
+    token = jwt.encode({"iss": ISSUER, "aud": AUDIENCE}, "s" * 32, algorithm="HS256", headers={"kid": "k1"})
+    with pytest.raises(IdTokenError):
+        _verify(token)
+
+
+@pytest.mark.parametrize("body", [{}, {"keys": "x"}, {"keys": [{"kty": "RSA"}]}, [], None])
+def test_malformed_jwks(jwks, private_key, body):
+    jwks["body"] = body
+    with pytest.raises(IdTokenError):
+        _verify(_token(private_key))
+
+
+def test_broken_jwk_fields(jwks, private_key):
+    jwks["body"]["keys"][0]["n"] = "!!"
+    with pytest.raises(IdTokenError):
+        _verify(_token(private_key))
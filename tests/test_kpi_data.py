@@ -0,0 +1,77 @@
+# tests/test_kpi_data.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpi_charts import monthly_series
+from kpi_data import MONTHS, achievement_matrix, cumulative_achievement, monthly_cube
+from kpi_overview import selected_uid
+
+
+def _result(rows):
+    return pd.DataFrame(rows, columns=["UID", "월", "목표", "실적"])
+
+
+@pytest.fixture
+def cube():
+    return monthly_cube(_result([
+        ("A", "1", "100", "80"),
+        ("A", "1", "0", "20"),      # 같은 월 여러 행은 합계
+        ("A", "2", "100", "150"),
+        ("A", "3", "100", ""),      # 실적 미보고
+        ("B", 1, 50, 100),          # 낮을수록 좋은 지표
+        ("B", 2, 50, 0),
+        ("C", 1, 10, 10),           # 잔량형
+        ("C", 2, 20, 5),
+        ("A", "13", 1, 1),          # 범위 밖 월·숫자가 아닌 월은 제외
+        ("A", "x", 1, 1),
+    ]))
+
+
+def test_monthly_cube_sums_and_counts(cube):
+    assert list(cube.columns) == [(kind, m) for kind in ("목표", "실적", "입력") for m in MONTHS]
+    assert cube.loc["A", ("목표", 1)] == 100 and cube.loc["A", ("실적", 1)] == 100
+    assert cube.loc["A", ("입력", 1)] == 2
+    assert cube.loc["A", ("목표", 3)] == 100 and np.isnan(cube.loc["A", ("실적", 3)])
+    assert cube.loc["A", ("입력", 3)] == 1
+    assert np.isnan(cube.loc["A", ("목표", 4)]) and np.isnan(cube.loc["A", ("입력", 4)])
+
+
+def test_achievement_matrix(cube):
+    ratio = achievement_matrix(cube, ["A", "B", "Z"], lower_is_better=["B"])
+    assert list(ratio.columns) == MONTHS
+    assert ratio.loc["A", 1] == 1.0 and ratio.loc["A", 2] == 1.5
+    assert np.isnan(ratio.loc["A", 3])            # 실적 없음
+    assert ratio.loc["B", 1] == 0.5               # 목표/실적
+    assert np.isnan(ratio.loc["B", 2])            # 분모 0
+    assert ratio.loc["Z"].isna().all()            # 큐브에 없는 UID
+
+
+def test_cumulative_achievement(cube):
+    table = cumulative_achievement(cube, ["A", "B", "C"], month=2, snapshot_uids=["C"], lower_is_better=["B"])
+    assert table.loc["A", "목표"] == 200 and table.loc["A", "실적"] == 250
+    assert table.loc["A", "차이"] == 50 and table.loc["A", "달성률"] == 1.25
+    assert table.loc["B", "달성률"] == 1.0        # (50+50)/(100+0)
+    assert table.loc["C", "목표"] == 20 and table.loc["C", "실적"] == 5   # 기준월 값만
+    assert table.loc["C", "달성률"] == 0.25
+
+
+def test_cumulative_achievement_zero_denominator():
+    cube = monthly_cube(_result([("A", 1, 0, 5)]))
+    assert np.isnan(cumulative_achievement(cube, ["A"], month=1).loc["A", "달성률"])
+
+
+def test_monthly_series_keeps_blank_valued_months(cube):
+    months, target, result = monthly_series(cube, "A")
+    assert months == (1, 2, 3)
+    assert target == (100.0, 100.0, 100.0)
+    assert result == (100.0, 150.0, 0.0)   # 행은 있지만 실적이 빈 월은 0
+    assert monthly_series(cube, "Z") == ((), (), ())
+
+
+def test_selected_uid():
+    uids = ["A", "B"]
+    assert selected_uid([{"customdata": ["B", "90%"]}], uids) == "B"
+    assert selected_uid([{"customdata": "A"}], uids) == "A"
+    assert selected_uid([{"x": "1월"}, {"customdata": ["Z"]}], uids) is None
+    assert selected_uid([], uids) is None
@@ -0,0 +1,84 @@
+# tests/test_search.py
+import pandas as pd
+
+from division_page import MemoIndex, memo_mask
+from kpi_search import SearchDoc, SearchIndex, _division_docs, _memo_docs, ngrams, normalize
+
+DIVISIONS = {"sa": {"memo": "영업"}, "gs": {"memo": "글로벌"}}
+
+MEMOS = pd.DataFrame({
+    "본부": ["영업본부", "영업/글로벌", "글로벌전략본부", None, "영업본부"],
+    "년도": ["2024", "2024", 2024, 2024, ""],
+    "월": [3, "5", 5, 5, 1],
+    "입력자": ["김", "이", "<박>", "최", "정"],
+    "메모": ["환율 영향", "공동 메모", "수출 <증가>", "본부 없음", "월 없음"],
+})
+
+
+def test_memo_mask_matches_shared_rows():
+    assert list(memo_mask(MEMOS, DIVISIONS["sa"])) == [True, True, False, False, True]
+    assert list(memo_mask(MEMOS, DIVISIONS["gs"])) == [False, True, True, False, False]
+
+
+def test_memo_index_groups_by_division_and_month():
+    index = MemoIndex(DIVISIONS, MEMOS)
+    assert [m.text for m in index.get("sa", 2024, 3)] == ["환율 영향"]
+    assert [m.text for m in index.get("gs", 2024, 5)] == ["공동 메모", "수출 &lt;증가&gt;"]
+    assert index.get("gs", 2024, 5)[1].writer == "&lt;박&gt;"
+    assert index.months("sa") == [(2024, 5), (2024, 3)]   # 최신순, 년도 없는 행 제외
+    assert index.get("sa", 2023, 1) == [] and index.months("rd") == []
+
+
+def test_normalize_and_ngrams():
+    assert normalize(" 매출 성장 Rate ") == "매출성장rate"
+    assert ngrams("매출액") == {"매출", "출액"}
+    assert ngrams("매") == {"매"} and ngrams("") == set()
+
+
+def _index():
+    docs = [
+        SearchDoc("메모", "sa", 2024, 3, "", "김", "환율 영향으로 매출 감소"),
+        SearchDoc("KPI", "sa", 2023, 0, "SA-01", "매출 성장", ""),
+        SearchDoc("KPI", "gs", 2024, 0, "GS-01", "해외 매출 확대", ""),
+        SearchDoc("정성", "gs", 2024, 2, "GS-02", "신규 거래처", "거래처 3곳 발굴"),
+    ]
+    return SearchIndex(docs)
+
+
+def test_search_orders_by_kind_then_year():
+    hits = _index().search("매출")
+    assert [(d.kind, d.uid) for d in hits] == [("KPI", "GS-01"), ("KPI", "SA-01"), ("메모", "")]
+
+
+def test_search_ignores_spaces_and_case():
+    assert [d.uid for d in _index().search("해외매출")] == ["GS-01"]
+    assert [d.uid for d in _index().search("sa-01")] == ["SA-01"]
+
+
+def test_search_requires_contiguous_match():
+    assert _index().search("매출 영향") == []   # n-gram 은 모두 있지만 연속 일치 아님
+
+
+def test_search_single_char_limit_and_filter():
+    index = _index()
+    assert {d.uid for d in index.search("곳")} == {"GS-02"}
+    assert len(index.search("매출", limit=1)) == 1
+    assert [d.division for d in index.search("매출", division_filter=lambda key: key == "sa")] == ["sa", "sa"]
+    assert index.search("   ") == [] and index.search("없는말") == []
+
+
+def test_docs_from_sheets_skip_invalid_periods():
+    target = pd.DataFrame({
+        "년도": ["2024", "2024", "x"], "UID": ["SA-01", "SA-02", "SA-03"],
+        "추진 목표": ["매출 성장", "고객 만족", "잘못된 행"], "지표 유형": ["정량", "정성", "정량"],
+    })
+    result = pd.DataFrame({
+        "년도": [2024, 2024, 2024], "월": [1, 2, None], "UID": ["SA-02", "SA-01", "SA-02"],
+        "목표": ["설문 2회", 100, "x"], "실적": [None, 90, "y"],
+    })
+    docs = _division_docs("sa", target, result)
+    assert [(d.kind, d.uid, d.month, d.text) for d in docs] == [
+        ("KPI", "SA-01", 0, ""), ("KPI", "SA-02", 0, ""), ("정성", "SA-02", 1, "설문 2회"),
+    ]
+    memos = _memo_docs(DIVISIONS, MEMOS)
+    assert sorted((d.division, d.month) for d in memos) == [("gs", 5), ("gs", 5), ("sa", 3), ("sa", 5)]
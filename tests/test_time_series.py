@@ -0,0 +1,46 @@
+# tests/test_time_series.py
+import pandas as pd
+
+from time_series import downsample, resolution_for, visible_series, window
+
+
+def _monthly(start, periods):
+    months = pd.period_range(start, periods=periods, freq="M").strftime("%Y-%m")
+    return pd.DataFrame({"기간": months, "값": range(periods)})
+
+
+def test_resolution_for_boundaries():
+    assert resolution_for(1) == "월"
+    assert resolution_for(60) == "월"
+    assert resolution_for(61) == "분기"
+    assert resolution_for(180) == "분기"
+    assert resolution_for(181) == "연"
+
+
+def test_window_keeps_last_months():
+    df = _monthly("2020-01", 24)
+    assert list(window(df, 3)["기간"]) == ["2021-10", "2021-11", "2021-12"]
+    assert window(df, None) is df
+
+
+def test_downsample_month_is_identity():
+    df = _monthly("2020-01", 5)
+    assert downsample(df, "월", ["값"]) is df
+
+
+def test_downsample_quarter_and_year_means():
+    df = _monthly("2020-02", 7)   # 2020-02 ~ 2020-08, 마지막 분기는 진행 중
+    quarterly = downsample(df, "분기", ["값"])
+    assert list(quarterly["기간"]) == ["2020-01", "2020-04", "2020-07"]
+    assert list(quarterly["값"]) == [0.5, 3.0, 5.5]
+    yearly = downsample(_monthly("2020-11", 4), "연", ["값"])
+    assert list(yearly["기간"]) == ["2020-01", "2021-01"]
+    assert list(yearly["값"]) == [0.5, 2.5]
+
+
+def test_visible_series_picks_resolution_from_span():
+    df = _monthly("2000-01", 240)
+    assert visible_series(df, "1년", ["값"])[1] == "월"
+    assert visible_series(df, "10년", ["값"])[1] == "분기"
+    sliced, resolution = visible_series(df, "전체", ["값"])
+    assert resolution == "연" and len(sliced) == 20
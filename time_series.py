@@ -0,0 +1,44 @@
+# time_series.py
+import pandas as pd
+
+# 홈 시계열 보기 범위 (개월, None = 전체)
+RANGE_OPTIONS = {"1년": 12, "3년": 36, "5년": 60, "10년": 120, "전체": None}
+
+# 보이는 구간 길이별 해상도: 월별은 5년까지, 분기는 15년까지, 그 이상은 연도별
+MONTHLY_MAX_MONTHS = 60
+QUARTERLY_MAX_MONTHS = 180
+MONTHS_PER_PERIOD = {"월": 1, "분기": 3, "연": 12}
+TICK_FORMATS = {"월": "%Y-%m", "분기": "%Y Q%q", "연": "%Y"}
+
+
+def resolution_for(months):
+    if months <= MONTHLY_MAX_MONTHS:
+        return "월"
+    if months <= QUARTERLY_MAX_MONTHS:
+        return "분기"
+    return "연"
+
+
+def window(df, months, period_col="기간"):
+    """마지막 기간 기준 최근 months 개월 ("YYYY-MM" 문자열 비교)"""
+    if months is None or df.empty:
+        return df
+    last = pd.Period(df[period_col].max(), freq="M")
+    return df[df[period_col] > str(last - months)]
+
+
+def downsample(df, resolution, columns, period_col="기간"):
+    """분기·연 단위 월평균으로 집계 (진행 중인 마지막 구간도 다른 구간과 같은 단위). 기간 = 구간 첫 달"""
+    if resolution == "월":
+        return df
+    months = pd.PeriodIndex(df[period_col], freq="M")
+    start = months.asfreq("Q" if resolution == "분기" else "Y", "start").asfreq("M", "start").strftime("%Y-%m")
+    return df[columns].groupby(start).mean().reset_index(names=period_col)
+
+
+def visible_series(df, range_label, columns, period_col="기간"):
+    """보기 범위만 잘라 해상도에 맞게 집계 → (df, 해상도). 월별 상세는 보이는 구간에만"""
+    sliced = window(df, RANGE_OPTIONS[range_label], period_col)
+    span = len(sliced[period_col].unique())
+    resolution = resolution_for(span)
+    return downsample(sliced, resolution, columns, period_col), resolution
@@ -1,18 +1,45 @@
+import logging
+import time
 import streamlit as st
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 import requests as py_requests
 from urllib.parse import urlencode
 import pandas as pd
 import plotly.graph_objects as go
+from payload import finish_payload_meter, start_payload_meter
+from auth import EXPIRED_KEY, end_session, flush_session_cookie, pop_refresh_token, restore_session, start_session
+from debug_panel import render_debug_panel
+from helpers import frame_version, with_script_ctx
+from division_page import load_divisions
+from id_token import GOOGLE_ISSUERS, GOOGLE_JWKS_URL, IdTokenError, user_from_claims, verify_id_token
+from rerun_metrics import timed_fragment, timed_stage
+from metrics import count_loader, record_loader_miss, start_metrics_exporter, timed_fetch
+from navigation import render_nav
+from raw_material import RawMaterialUnavailable, read_store, refresh_series, store_path
+from time_series import MONTHS_PER_PERIOD, RANGE_OPTIONS, TICK_FORMATS, visible_series
+
+logger = logging.getLogger(__name__)
 
 # ======== Google OAuth2 설정 ========
 GOOGLE_CLIENT_ID = st.secrets["google_oauth"]["GOOGLE_CLIENT_ID"]
 GOOGLE_CLIENT_SECRET = st.secrets["google_oauth"]["GOOGLE_CLIENT_SECRET"]
 REDIRECT_URI = st.secrets["google_oauth"]["REDIRECT_URI"]
 
-AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
-TOKEN_URL = "https://oauth2.googleapis.com/token"
-USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+# 외부 API 주소는 secrets [endpoints] 로 바꿀 수 있음 (로컬 대체 서버: bench/standin_server.py)
+ENDPOINTS = st.secrets.get("endpoints", {})
+AUTH_URL = ENDPOINTS.get("google_auth_url", "https://accounts.google.com/o/oauth2/v2/auth")
+TOKEN_URL = ENDPOINTS.get("google_token_url", "https://oauth2.googleapis.com/token")
+USERINFO_URL = ENDPOINTS.get("google_userinfo_url", "https://www.googleapis.com/oauth2/v2/userinfo")
+JWKS_URL = ENDPOINTS.get("google_jwks_url", GOOGLE_JWKS_URL)
+ID_TOKEN_ISSUERS = (ENDPOINTS["google_issuer"],) if "google_issuer" in ENDPOINTS else GOOGLE_ISSUERS
+RAW_MATERIAL_URL = ENDPOINTS.get(
+    "raw_material_url",
+    "https://api.odcloud.kr/api/3039951/v1/uddi:b6699de8-3b19-4ab7-8ed7-894636ad6c6d_202004071625",
+)
+
+# Google 이 redirect_uri 로 돌려보낼 때 붙이는 파라미터
+OAUTH_CALLBACK_PARAMS = ("code", "scope", "authuser", "prompt", "hd", "state")
 
 def get_authorization_url():
     params = {
@@ -33,31 +60,72 @@ def exchange_code_for_token(code):
         "redirect_uri": REDIRECT_URI,
         "grant_type": "authorization_code",
     }
-    response = py_requests.post(TOKEN_URL, data=data)
+    with timed_fetch("google_token"):
+        response = py_requests.post(TOKEN_URL, data=data)
+    return response.json()
+
+def refresh_access_token(refresh_token):
+    data = {
+        "refresh_token": refresh_token,
+        "client_id": GOOGLE_CLIENT_ID,
+        "client_secret": GOOGLE_CLIENT_SECRET,
+        "grant_type": "refresh_token",
+    }
+    with timed_fetch("google_token"):
+        response = py_requests.post(TOKEN_URL, data=data)
     return response.json()
 
 def get_user_info(access_token):
     headers = {"Authorization": f"Bearer {access_token}"}
-    response = py_requests.get(USERINFO_URL, headers=headers)
+    with timed_fetch("google_userinfo"):
+        response = py_requests.get(USERINFO_URL, headers=headers)
     return response.json()
 
+def identity_from_tokens(tokens):
+    """토큰 응답의 id_token 을 로컬 검증 (서명 키는 캐시) → 로그인당 외부 요청 1회. 검증 불가 시에만 userinfo 호출"""
+    if tokens.get("id_token"):
+        try:
+            claims = verify_id_token(tokens["id_token"], GOOGLE_CLIENT_ID, JWKS_URL, ID_TOKEN_ISSUERS)
+            return user_from_claims(claims)
+        except (IdTokenError, py_requests.RequestException) as e:
+            logger.warning("id_token 검증 실패, userinfo 로 대체: %s", e)
+    return get_user_info(tokens["access_token"])
+
 # ======== 인증 처리 ========
 st.set_page_config(
     page_title="세아특수강 본부별 주요 추진 목표 및 실적 대시보드",
     layout="wide",
     initial_sidebar_state="expanded"
 )
+start_metrics_exporter()  # secrets [metrics] 설정 시 프로세스당 1회
 
 code = st.query_params.get("code", None)
-user_info = None
+user_info = restore_session()  # 세션 쿠키가 유효하면 네트워크 호출 없이 복원
 
 if code:
-    tokens = exchange_code_for_token(code)
-    if tokens.get("access_token"):
-        user_info = get_user_info(tokens["access_token"])
-        st.session_state["user"] = user_info
-else:
-    user_info = st.session_state.get("user", None)
+    # 인가 코드는 1회용: 이미 로그인된 세션이면 교환하지 않고, 교환 후에는 URL 에서 지움
+    # (남겨 두면 재실행마다 Google 왕복 2회 + 이미 쓴 코드라 실패)
+    if not user_info:
+        tokens = exchange_code_for_token(code)
+        if tokens.get("access_token"):
+            info = identity_from_tokens(tokens)
+            if info.get("email"):
+                user_info = st.session_state["user"] = info
+                start_session(info, tokens.get("refresh_token"))
+    for key in OAUTH_CALLBACK_PARAMS:
+        st.query_params.pop(key, None)
+elif not user_info and EXPIRED_KEY in st.session_state:
+    # 세션 쿠키 만료: 로그인 때 받아 둔 refresh token 이 있으면 동의 화면 없이 갱신
+    expired = st.session_state.pop(EXPIRED_KEY)
+    refresh_token = pop_refresh_token(expired.get("sid"))
+    if refresh_token:
+        tokens = refresh_access_token(refresh_token)
+        if tokens.get("access_token"):
+            info = identity_from_tokens(tokens)
+            if info.get("email"):
+                user_info = st.session_state["user"] = info
+                start_session(info, tokens.get("refresh_token") or refresh_token)
+flush_session_cookie()
 
 if not user_info:
     st.markdown("<h2>Google 로그인 필요</h2>", unsafe_allow_html=True)
@@ -66,44 +134,53 @@ if not user_info:
     st.markdown(f"[👉 Google 계정으로 로그인하기]({auth_url})", unsafe_allow_html=True)
     st.stop()
 
+# 로그인 확인 뒤부터 기록: 위의 st.stop() 으로 끝나는 실행은 finish_payload_meter() 에 닿지 않음
+start_payload_meter("홈")  # 이번 실행의 전송량(요소별 직렬화 크기) 기록
+
 # ======== 프로필 표시 + 로그아웃 ========
+# 프래그먼트: 사이드바 조작 시 홈 전체가 아닌 이 영역만 재실행 (로그아웃만 전체 재실행)
+@timed_fragment("사이드바 프로필")
 def render_sidebar_profile(user):
     name = user.get("name", "사용자")
     email = user.get("email", "")
     picture_url = user.get("picture", "")
 
-    with st.sidebar:
-        st.markdown("""
-        <style>
-        .profile-name {
-            font-size: 16px;
-            margin-top: 10px;
-            color: #1f2937;
-        }
-        .profile-email {
-            font-size: 13px;
-            color: #6b7280;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+    st.markdown("""
+    <style>
+    .profile-name {
+        font-size: 16px;
+        margin-top: 10px;
+        color: #1f2937;
+    }
+    .profile-email {
+        font-size: 13px;
+        color: #6b7280;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+    st.markdown('<div class="profile-box">', unsafe_allow_html=True)
 
-        st.markdown('<div class="profile-box">', unsafe_allow_html=True)
+    if picture_url:
+        st.image(picture_url, width=80)
 
-        if picture_url:
-            st.image(picture_url, width=80)
+    st.markdown(f"<div class='profile-name'>{name}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='profile-email'>{email}</div>", unsafe_allow_html=True)
 
-        st.markdown(f"<div class='profile-name'>{name}</div>", unsafe_allow_html=True)
-        st.markdown(f"<div class='profile-email'>{email}</div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
 
-        st.markdown("</div>", unsafe_allow_html=True)
+    if st.button("🔓 로그아웃", key="logout_button"):
+        end_session()
+        for key in ["user"]:
+            if key in st.session_state:
+                del st.session_state[key]
+        st.rerun(scope="app")
 
-        if st.button("🔓 로그아웃", key="logout_button"):
-            for key in ["user"]:
-                if key in st.session_state:
-                    del st.session_state[key]
-            st.rerun()
+render_nav(load_divisions())  # 권한 있는 본부 페이지만 메뉴에 표시
 
-render_sidebar_profile(user_info)
+# 프래그먼트는 자기 본문 밖 컨테이너에 쓸 수 없으므로 사이드바 안에서 호출
+with st.sidebar:
+    render_sidebar_profile(user_info)
 
 # ======== 스타일 ========
 custom_home_css = """
@@ -156,29 +233,31 @@ st.image("logo.gif", width=200)
 st.markdown("<h1>본부별 주요 추진 목표 및 실적</h1>", unsafe_allow_html=True)
 
 # ======== 공공데이터 API 연동 함수 ========
-@st.cache_data
-def fetch_raw_material_data():
-    url = "https://api.odcloud.kr/api/3039951/v1/uddi:b6699de8-3b19-4ab7-8ed7-894636ad6c6d_202004071625"
-    service_key = st.secrets["api"]["raw_material_service_key"]
-
-    params = {
-        "page": 1,
-        "perPage": 1000,
-        "serviceKey": service_key
-    }
+RAW_MATERIAL_TTL_S = 6 * 3600  # 월별 지표: 6시간마다 새 기간만 확인
 
-    response = py_requests.get(url, params=params)
-    response.raise_for_status()
-    data = response.json()
-
-    df = pd.DataFrame(data["data"])
-    df = df[["기간", "철광석(달러_톤)", "철스크랩(달러_톤)"]]
-    df = df.sort_values("기간")
+@count_loader("raw_material")
+@st.cache_data(ttl=RAW_MATERIAL_TTL_S, show_spinner=False)
+def fetch_raw_material_data():
+    """전체 쪽 수집 + 디스크 저장본 기준 증분 요청 (raw_material.py)"""
+    record_loader_miss("raw_material")
+    df = refresh_series(RAW_MATERIAL_URL, st.secrets["api"]["raw_material_service_key"])
+    df.attrs["version"] = frame_version(df)  # 그래프 캐시 키 (재실행마다 전체를 해시하지 않게)
     return df
 
+def raw_material_series():
+    """(시계열, 저장본 여부). API 가 응답하지 않으면 마지막 저장본, 그것도 없으면 None"""
+    try:
+        return fetch_raw_material_data(), False
+    except RawMaterialUnavailable as e:
+        logger.warning("원자재 가격 API 실패, 저장본 사용: %s", e)
+        return read_store(store_path(RAW_MATERIAL_URL, st.secrets["api"]["raw_material_service_key"])), True
+
 # ======== 그래프 생성 함수 ========
-def create_price_chart(df):
-    df_recent = df[df["기간"] >= "2022-01"]
+PRICE_COLUMNS = ["철광석(달러_톤)", "철스크랩(달러_톤)"]
+
+def create_price_chart(df, range_label):
+    df_recent, resolution = visible_series(df, range_label, PRICE_COLUMNS)
+    average = "" if resolution == "월" else f" ({resolution}별 월평균)"
 
     fig = go.Figure()
 
@@ -204,7 +283,8 @@ def create_price_chart(df):
 
     fig.update_layout(
         title="📈 철강 원자재 가격 동향",
-        xaxis_title="기간",
+        xaxis_title=f"기간{average}",
+        xaxis_tickformat=TICK_FORMATS[resolution],
         yaxis=dict(
             title=dict(text="철광석 가격 ($/톤)", font=dict(color="#1f77b4")),
             tickfont=dict(color="#1f77b4"),
@@ -225,21 +305,30 @@ def create_price_chart(df):
 
 # ======== 자동차 생산량 그래프 생성 함수 ========
 kama_path = st.secrets["google_sheets"]["kama_url"]
+KAMA_TTL_S = 1800  # 본부 시트(load_sheet)와 같은 갱신 주기
 
-@st.cache_data
+@count_loader("kama")
+@st.cache_data(ttl=KAMA_TTL_S, show_spinner=False)
 def load_data():
-    df_kama = pd.read_csv(kama_path)
+    record_loader_miss("kama")
+    with timed_fetch("sheets"):
+        df_kama = pd.read_csv(kama_path)
     df_kama.columns = df_kama.columns.str.strip()
     # 부품수출액 컬럼명 정규화 (괄호 문자 인코딩 차이 대응)
     export_col = next((c for c in df_kama.columns if "부품수출액" in c), None)
     if export_col and export_col != "부품수출액(백만불)":
         df_kama = df_kama.rename(columns={export_col: "부품수출액(백만불)"})
     df_kama["기간"] = df_kama["년"].astype(str) + "-" + df_kama["월"].astype(str).str.zfill(2)
+    df_kama.attrs["version"] = frame_version(df_kama)  # 그래프 캐시 키
     return df_kama
 
-def create_vehicle_production_chart():
-    df = load_data()
+PRODUCTION_COLUMNS = ["국내생산", "해외생산", "KD", "부품수출액(백만불)"]
 
+def create_vehicle_production_chart(df, range_label):
+    df, resolution = visible_series(df, range_label, PRODUCTION_COLUMNS)
+    # 분기·연 단위는 월평균 (진행 중인 마지막 구간이 합계로 줄어 보이지 않게)
+    average = "" if resolution == "월" else f" ({resolution}별 월평균)"
+    half_period = pd.Timedelta(days=15 * MONTHS_PER_PERIOD[resolution])
     fig = go.Figure()
     fig.add_trace(go.Bar(x=df["기간"], y=df["국내생산"], name="국내생산", marker_color="#5dade2", yaxis="y1"))
     fig.add_trace(go.Bar(x=df["기간"], y=df["해외생산"], name="해외생산", marker_color="#1a6b9a", yaxis="y1"))
@@ -256,17 +345,17 @@ def create_vehicle_production_chart():
     fig.update_layout(
         barmode='stack',
         title="🚗 자동차 생산량 및 부품수출액 추이",
-        xaxis_title="기간",
+        xaxis_title=f"기간{average}",
         xaxis=dict(
             tickangle=-45,
-            dtick="M1",
-            tickformat="%Y-%m",
+            dtick=f"M{MONTHS_PER_PERIOD[resolution]}",
+            tickformat=TICK_FORMATS[resolution],
             range=[
-                (pd.to_datetime(df["기간"].min()) - pd.Timedelta(days=15)).strftime("%Y-%m-%d"),
-                (pd.to_datetime(df["기간"].max()) + pd.Timedelta(days=15)).strftime("%Y-%m-%d"),
+                (pd.to_datetime(df["기간"].min()) - half_period).strftime("%Y-%m-%d"),
+                (pd.to_datetime(df["기간"].max()) + half_period).strftime("%Y-%m-%d"),
             ],
         ),
-        yaxis=dict(title="생산량", side="left"),
+        yaxis=dict(title=f"생산량{average}", side="left"),
         yaxis2=dict(title="부품수출액(백만불)", side="right", overlaying="y", showgrid=False),
         height=500,
         margin=dict(t=120, b=40, l=40, r=60),
@@ -274,13 +363,97 @@ def create_vehicle_production_chart():
     )
     return fig
 
-# ======== 본문 콘텐츠 구성 ========
-fig_production = create_vehicle_production_chart()
-st.plotly_chart(fig_production, use_container_width=True)
+# 홈 그래프는 모든 로그인 세션이 공유. 키 = (종류, 보기 범위, 데이터 버전): 로더가 캐시 미스 때 계산한 내용 해시라
+# 재실행마다 DataFrame 을 해시하지 않고, 데이터가 갱신(각 로더의 TTL)돼 내용이 바뀔 때만 새로 생성.
+# 공유 Figure 는 읽기 전용: st.plotly_chart 는 to_dict() 사본을 직렬화하므로 그리기만으로는 바뀌지 않음 (update_* 호출 금지).
+# 직렬화한 JSON 대신 Figure 를 캐시하는 이유: st.plotly_chart 는 dict/JSON 입력을 Figure 로 다시 검증해(차트당 ~12 ms)
+# Figure 를 넘길 때(~3 ms)보다 느림
+HOME_FIGURES = {"production": create_vehicle_production_chart, "price": create_price_chart}
+DEFAULT_RANGES = {"production": "3년", "price": "5년"}
+
+@count_loader("home_figure")
+@st.cache_resource(max_entries=len(HOME_FIGURES) * len(RANGE_OPTIONS) * 2, show_spinner=False)  # 갱신 직후 이전 데이터분까지
+def _cached_home_figure(kind, _df, range_label, version):
+    record_loader_miss("home_figure")
+    return HOME_FIGURES[kind](_df, range_label)
+
+def cached_home_figure(kind, df, range_label):
+    # 저장본(캐시되지 않은 read_store 결과)은 버전이 없어 여기서 계산
+    version = df.attrs.get("version") or frame_version(df)
+    return _cached_home_figure(kind, df, range_label, version)
+
+def range_picker(kind):
+    options = list(RANGE_OPTIONS)
+    return st.radio(
+        "보기 범위", options, index=options.index(DEFAULT_RANGES[kind]),
+        horizontal=True, key=f"home_range_{kind}", label_visibility="collapsed",
+    )
 
-df_price = fetch_raw_material_data()
-fig_price = create_price_chart(df_price)
-st.plotly_chart(fig_price, use_container_width=True)
+# ======== 외부 데이터 동시 로드 ========
+# KAMA 시트와 원자재 API 를 동시에 요청하고, 먼저 도착한 쪽 그래프부터 그림 (느린 공공 API 가 생산량 그래프를 막지 않음)
+HOME_LOAD_TIMEOUT_S = {"production": 15, "price": 12}
+PLACEHOLDER_AFTER_S = 0.05  # 캐시 적중(대부분의 재실행)이면 이 안에 끝나 자리표시 없이 바로 그림
+
+@st.cache_resource
+def _home_pool():
+    # 시간 초과된 요청은 백그라운드에서 마저 끝나 캐시만 채움 (이번 실행은 기다리지 않음)
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="home-load")
+
+def _submit(fn):
+    return _home_pool().submit(with_script_ctx(fn))
+
+def render_production_chart(slot, future):
+    with timed_stage("chart 자동차 생산량"):
+        if future is None or future.exception() is not None:
+            slot.warning("자동차 생산량 데이터를 불러오지 못했습니다.")
+            return
+        with slot.container():
+            fig = cached_home_figure("production", future.result(), range_picker("production"))
+            st.plotly_chart(fig, use_container_width=True)
+
+def render_price_chart(slot, future):
+    with timed_stage("chart 원자재 가격"):
+        if future is None:
+            # 시간 초과: 저장본이라도 표시
+            df_price = read_store(store_path(RAW_MATERIAL_URL, st.secrets["api"]["raw_material_service_key"]))
+            stale = True
+        elif future.exception() is not None:
+            df_price, stale = None, True
+        else:
+            df_price, stale = future.result()
+        if df_price is None:
+            slot.warning("원자재 가격 데이터를 불러오지 못했습니다.")
+            return
+        with slot.container():
+            if stale:
+                st.caption("⚠️ 원자재 가격 API 가 응답하지 않아 마지막으로 저장된 데이터를 표시합니다.")
+            fig = cached_home_figure("price", df_price, range_picker("price"))
+            st.plotly_chart(fig, use_container_width=True)
+
+# ======== 본문 콘텐츠 구성 ========
+renderers = {"production": render_production_chart, "price": render_price_chart}
+slots = {kind: st.empty() for kind in renderers}
+futures = {_submit(load_data): "production", _submit(raw_material_series): "price"}
+started = time.monotonic()
+wait(futures, timeout=PLACEHOLDER_AFTER_S)
+for future, kind in futures.items():
+    if not future.done():
+        slots[kind].info("⏳ 그래프 데이터를 불러오는 중입니다...")
+
+pending = set(futures)
+while pending:
+    elapsed = time.monotonic() - started
+    expired = {f for f in pending if elapsed >= HOME_LOAD_TIMEOUT_S[futures[f]]}
+    for future in expired:
+        logger.warning("홈 데이터 로드 시간 초과: %s", futures[future])
+        renderers[futures[future]](slots[futures[future]], None)
+    pending -= expired
+    if not pending:
+        break
+    next_deadline = min(HOME_LOAD_TIMEOUT_S[futures[f]] for f in pending) - elapsed
+    done, pending = wait(pending, timeout=next_deadline, return_when=FIRST_COMPLETED)
+    for future in done:
+        renderers[futures[future]](slots[futures[future]], future)
 
 # ======== 푸터 ========
 st.markdown("""
@@ -303,3 +476,7 @@ st.markdown("""
   ⓒ 2025 SeAH Special Steel Corp. All rights reserved.
 </div>
 """, unsafe_allow_html=True)
+
+# 전송량 집계 (예산 초과 시 경고 로그) + 관리자 진단 패널
+finish_payload_meter()
+render_debug_panel()